@@ -1,19 +1,32 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name="pdf_annotation_tool",
     version="1.0",
-    packages=find_packages(),
+    package_dir={"": "src"},
+    py_modules=["main"],
+    packages=[
+        "pdf_annotation_tool",
+        "pdf_annotation_tool.builder",
+        "pdf_annotation_tool.manipulation",
+        "pdf_annotation_tool.selection",
+        "pdf_annotation_tool.utils",
+    ],
     install_requires=[
         "PyMuPDF",
         "requests",
         "PyQt5",
         "Pillow",
-        "langchain",
-        "langchain-openai",
-        "unstructured",
-        "shapely"
+        "shapely",
+        "numpy"
     ],
+    extras_require={
+        "llm": [
+            "langchain",
+            "langchain-openai",
+            "unstructured"
+        ],
+    },
     entry_points={
         "gui_scripts": [
             "pdf_annotation_tool=main:main",
@@ -21,11 +21,8 @@
 
 
 import sys
-from pdf_annotation_tool.tool import PDFAnnotationTool
 from PyQt5.QtWidgets import QApplication
 
-from pdf_annotation_tool.utils.files import PDFOpenDialog
-
 
 ########################################################################
 #### Loading Configurations 
@@ -64,9 +61,15 @@ def main():
     # Start the GUI
 #   mp.set_start_method("spawn", force=True)  # It might be needed on Windows ????
     app = QApplication(sys.argv)
+    
+    # Import the GUI only after the Qt application exists, so that heavy dependencies are loaded once Qt is ready
+    from pdf_annotation_tool.tool import PDFAnnotationTool
+    from pdf_annotation_tool.utils.files import PDFOpenDialog
+    
     window = PDFAnnotationTool()
     #window.resize(200, 600)
     window.show()
+    app.processEvents() # Force the first paint before any further loading
     
     
     # Initial GUI configuration
@@ -20,7 +20,9 @@
 # -----------------------------------------------------------------------------
 
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import Tuple, TYPE_CHECKING
+import re
 import uuid
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton, 
@@ -30,13 +32,68 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton,
 from PyQt5.QtGui import QColor, QPalette, QFocusEvent
 
 from pdf_annotation_tool.manipulation.trees import BaseSelectionTree, PageTreeWidget
-from pdf_annotation_tool.manipulation.visualizer import TreesPanel
 from pdf_annotation_tool.selection.data import SelectionCategory
 from pdf_annotation_tool.selection.graphic import SelectableRegionItem
 if TYPE_CHECKING:
     from pdf_annotation_tool.tool import PDFAnnotationTool
 
 
+# The pattern of a valid image resolution given as "WIDTHxHEIGHT", e.g., "512x512", "512 X 512" or "512×512"
+_RES_RE = re.compile(r"^\s*(\d+)\s*[xX×]\s*(\d+)\s*$")
+
+
+# The stylesheet of category buttons, where `color` is the category color and `selected_bg` the background when checked (see `_build_style`)
+_QSS_TEMPLATE = """
+        QPushButton {{
+            border: 2px solid {color};
+            border-radius: 8px;
+            padding: 4px 8px;
+            min-width: 80px;
+            min-height: 28px;
+            background-color: transparent;
+        }}
+        QPushButton:checked {{
+            border: 3px solid {color};
+            background-color: {selected_bg};
+            font-weight: bold;
+        }}
+        QPushButton:hover {{
+            border: 2px solid {color};
+            background-color: palette(midlight);
+        }}
+        QPushButton:checked:hover {{
+            border: 3px solid {color};
+            background-color: {selected_bg};
+        }}
+        """
+
+
+@lru_cache(maxsize=256)
+def _selected_bg(color: str, is_dark: bool, alpha: int) -> str:
+    """Return the background color of a selected category button, computed by blending `color` (in hex format) with light or dark 
+    based on `is_dark`, and by setting its `alpha` value (0-255). It is cached since categories have a small and fixed set of colors."""
+    
+    qcolor = QColor(color)
+    blended = qcolor.lighter(150) if is_dark else qcolor.darker(120)
+    blended.setAlpha(alpha)
+    return blended.name(QColor.HexArgb)
+
+
+@lru_cache(maxsize=256)
+def _build_style(color: str, is_dark: bool, selected: bool = False, alpha: int = 100) -> str:
+    """Return the stylesheet for a category button, based on `_QSS_TEMPLATE`. It is used by `SelectionDialog` to precompute the style of each category.
+        - color: the border color of the button in hex format, e.g., "#RRGGBB"
+        - is_dark: if True, the current theme is dark and the selected background is lightened (darkened otherwise)
+        - selected: if True, the button is in selected state
+        - alpha: the alpha value (0-255) for the selected background color
+    """
+
+    # Compute the selected background color by blending with light or dark
+    selected_bg = _selected_bg(color, is_dark, alpha) if selected else "transparent"
+    return _QSS_TEMPLATE.format(color=color, selected_bg=selected_bg)
+
+
+
 @dataclass
 class SelectionUserSpecific: 
     """Data structure to store user specific information about a selection. These are given by `SelectionDialog`."""
@@ -54,6 +111,11 @@ class SelectionDialog(QDialog):
     cancelled the dialog. It is used by `BaseSelectionHandler`."""
      
     MAX_IMAGE_RESOLUTION = "512x512" # default maximum image resolution for screenshots
+    
+    # The `(category, row, column, label)` of each category button in a 2x6 grid, computed once at import time
+    _CATEGORY_SPEC = tuple((category, row, col, f"{category.value.name} ({category.value.shortcut})")
+                           for i, category in enumerate(SelectionCategory) 
+                           for row, col in [divmod(i, 6)])
 
     def __init__(self, main_view: 'PDFAnnotationTool', last_title_id: str = None, parent: QWidget = None, default_img_resolution: Tuple[int, int] = MAX_IMAGE_RESOLUTION, initial_selection: SelectableRegionItem = None):
         """Initialize the dialog's graphic.
@@ -76,7 +138,7 @@ class SelectionDialog(QDialog):
         else:
             self.selected_category = None
             self.last_title_id = last_title_id
-            self.new_selection_id = str(uuid.uuid4())
+            self.new_selection_id = None # Generated on `accept`, so that cancelled dialogs do not generate it
         
         # Initialize the graphic
         super().__init__(parent)
@@ -85,20 +147,25 @@ class SelectionDialog(QDialog):
             
         layout = QVBoxLayout(self)
 
+        # Precompute the (unselected, selected) stylesheets of each category, since the theme does not change during the dialog's lifetime
+        self._is_dark = self.palette().color(QPalette.Window).value() < 128
+        self._styles = {c: (_build_style(c.value.color, self._is_dark, selected=False),
+                            _build_style(c.value.color, self._is_dark, selected=True))
+                        for c in SelectionCategory}
+
         # --- Category buttons ---
         layout.addWidget(QLabel("Select the Category:"))
         self.buttons = {}
+        self._current_category = None # The category whose button is currently checked (see `_onCategorySelected`)
         grid_layout = QGridLayout()
         # Create category buttons in a 2x6 grid
-        for i, category in enumerate(SelectionCategory):
-            row, col = divmod(i, 6)
-            btn_text = f"{category.value.name} ({category.value.shortcut})"
+        for category, row, col, btn_text in SelectionDialog._CATEGORY_SPEC:
             btn = QPushButton(btn_text)
             btn.setCheckable(True)
             if category.value.shortcut:
                 btn.setShortcut(category.value.shortcut)
-            btn.clicked.connect(lambda checked, c=category: self._onCategorySelected(c))
-            btn.setStyleSheet(self._category_btn_style(category.value.color, selected=False))
+            btn.clicked.connect(partial(self._onCategorySelected, category)) # the `checked` argument of the signal is dropped by PyQt
+            btn.setStyleSheet(self._styles[category][False])
             btn.setMinimumHeight(28)
             btn.setMinimumWidth(80)
             grid_layout.addWidget(btn, row, col)
@@ -109,11 +176,12 @@ class SelectionDialog(QDialog):
         
         # --- Tree ---
         layout.addWidget(QLabel("Choose Section Parent:"))
-        self.trees_panel = TreesPanel(self.main_view._selections, parent=self, show_page_tree=False, show_hier_tree=True, enable_drag_drop=False, enable_multi_selection=False)
+        self.trees_panel = self.main_view._get_or_build_trees_panel(parent=self)
         if self.last_title_id == None:
             self.last_title_id = self.trees_panel.hier_tree.root.data(0, BaseSelectionTree.ID_ROLE)
         self.trees_panel.hier_tree.expand_and_select_by_id(self.last_title_id)
         layout.addWidget(self.trees_panel)
+        self.trees_panel.show() # It is hidden when detached from the previous dialog (see `done`)
                 
         # --- Image resolution ---
         self.image_res_label = QLabel("Max Screenshot Resolution (WxH):")
@@ -128,6 +196,7 @@ class SelectionDialog(QDialog):
         layout.addWidget(self.button_box)
 
         self.ok_button = self.button_box.button(QDialogButtonBox.Ok)
+        self._ok_is_default = True # Whether `ok_button` is currently the default button (see `_set_ok_default`)
 
         self.button_box.accepted.connect(self.accept)
         self.button_box.rejected.connect(self.reject)
@@ -140,74 +209,44 @@ class SelectionDialog(QDialog):
     def on_search_text_focus_in(self, event: QFocusEvent) -> None:
         """Disable the OK button while typing in the search input to avoid accidental acceptance."""
         
-        self.ok_button.setDefault(False)
-        self.ok_button.setAutoDefault(False)
+        self._set_ok_default(False)
         super(QLineEdit, self.trees_panel.search_input).focusInEvent(event)
 
 
     def on_search_text_focus_out(self, event: QFocusEvent) -> None:
         """Restore the OK button default behavior when leaving the search input."""
         
-        self.ok_button.setDefault(True)
-        self.ok_button.setAutoDefault(True)
+        self._set_ok_default(True)
         super(QLineEdit, self.trees_panel.search_input).focusOutEvent(event)
 
 
-    def _category_btn_style(self, color: str, selected: bool=False, alpha: int=100) -> str:
-        """Return the stylesheet for a category button.
-            - color: the border color of the button in hex format, e.g., "#RRGGBB"
-            - selected: if True, the button is in selected state
-            - alpha: the alpha value (0-255) for the selected background color
-        """
+    def _set_ok_default(self, is_default: bool) -> None:
+        """Set whether the OK button is the default button, doing nothing if it is already in the given state."""
         
-        # Determine if the current theme is dark or light
-        palette = self.palette()
-        base_color = palette.color(QPalette.Window)
-        is_dark = base_color.value() < 128
-
-        # Compute the selected background color by blending with light or dark
-        qcolor = QColor(color)
-        if selected:
-            blended = qcolor.lighter(150) if is_dark else qcolor.darker(120)
-            blended.setAlpha(alpha)
-            selected_bg = blended.name(QColor.HexArgb)
-        else:
-            selected_bg = "transparent"
-
-        # Return the stylesheet
-        return (
-            f"""
-            QPushButton {{
-                border: 2px solid {color};
-                border-radius: 8px;
-                padding: 4px 8px;
-                min-width: 80px;
-                min-height: 28px;
-                background-color: transparent;
-            }}
-            QPushButton:checked {{
-                border: 3px solid {color};
-                background-color: {selected_bg};
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                border: 2px solid {color};
-                background-color: palette(midlight);
-            }}
-            QPushButton:checked:hover {{
-                border: 3px solid {color};
-                background-color: {selected_bg};
-            }}
-            """)
+        if self._ok_is_default == is_default:
+            return
+        self.ok_button.setDefault(is_default)
+        self.ok_button.setAutoDefault(is_default)
+        self._ok_is_default = is_default
+
 
-    
     def _onCategorySelected(self, category: SelectionCategory):
-        """Handle the selection of a category button."""
+        """Handle the selection of a category button. Only the buttons of the previous and new categories are restyled."""
         
         self.selected_category = category
-        for c, btn in self.buttons.items():
-            btn.setChecked(c == category) # Only the selected category button is checked
-            btn.setStyleSheet(self._category_btn_style(c.value.color, selected=(c == category))) # Update styles
+        prev = self._current_category
+        if prev is category:
+            self.buttons[category].setChecked(True) # Clicking a checked button unchecks it, keep it checked instead
+            return
+        
+        # Uncheck the previous category button (if any) and check the new one 
+        if prev is not None:
+            self.buttons[prev].setChecked(False)
+            self.buttons[prev].setStyleSheet(self._styles[prev][False])
+        btn = self.buttons[category]
+        btn.setChecked(True)
+        btn.setStyleSheet(self._styles[category][True])
+        self._current_category = category
 
 
     def accept(self):
@@ -252,9 +291,20 @@ class SelectionDialog(QDialog):
         if self.image_resolution is None:
             return
         
+        # Generate the id of a new selection
+        if self.new_selection_id is None:
+            self.new_selection_id = str(uuid.uuid4())
+        
         super().accept()
 
 
+    def done(self, result: int) -> None:
+        """Detach the trees panel before closing the dialog, since it is shared among dialogs and it should not be deleted with this dialog."""
+        
+        self.trees_panel.setParent(None)
+        super().done(result)
+
+
     def get_results(self) -> SelectionUserSpecific:
         """Return a `SelectionUserSpecific` instance with the user input, to be used by `BaseSelectionHandler`.
         It should be called after `accept()`."""
@@ -271,12 +321,9 @@ class SelectionDialog(QDialog):
         """Parse the image resolution from a string in the format "WIDTHxHEIGHT", e.g., "512x512".
         Return a tuple (WIDTH, HEIGHT) if valid, otherwise show an alert and return None."""
         
-        try: # Check that input given by the user is feasible
-            resolution = text.strip().lower().replace(" ", "").split("x")
-            img_res_x = int(resolution[0])
-            img_res_y = int(resolution[1])
-            return (img_res_x, img_res_y)
-        except Exception:
+        match = _RES_RE.match(text) # Check that input given by the user is feasible
+        if match is None:
             QMessageBox.warning(None, "Input not valid", 
                                 "Resolution not valid should be two integer divided by 'x', e.g. (512x512).")
             return None
+        return (int(match.group(1)), int(match.group(2)))
@@ -21,15 +21,29 @@
 
 import traceback
 import abc
-import base64
+import threading
+try:
+    import pybase64 as base64 # Optional SIMD implementation with the same interface of `base64`
+except ImportError:
+    import base64
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from io import BytesIO
+import numpy as np
 import fitz  # PyMuPDF
 from PIL import Image, ImageDraw, ImageFile
-from typing import List, Tuple, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 from PyQt5.QtWidgets import QMessageBox
 
-from shapely import Polygon
+try:
+    from numba import njit # Optional JIT compiler for `_ray_cast`
+except ImportError:
+    njit = None
+try:
+    import cv2 # Optional polygon rasterization for `extract_poly_image`
+except ImportError:
+    cv2 = None
 
 from pdf_annotation_tool.builder.dialog import SelectionDialog
 from pdf_annotation_tool.manipulation.trees import BaseSelectionTree
@@ -39,6 +53,34 @@ if TYPE_CHECKING:
     from pdf_annotation_tool.tool import PDFAnnotationTool
 
 
+def _ray_cast(px: np.ndarray, py: np.ndarray, vx: np.ndarray, vy: np.ndarray) -> np.ndarray:
+    """Ray casting of the points `(px[i], py[i])` against the polygon with vertices `(vx[j], vy[j])`. It returns a boolean array
+    which is `True` for the points inside the polygon. It is compiled with Numba if available, see `PolySelectionHandler.points_in_polygon`."""
+    
+    n = vx.shape[0]
+    inside = np.zeros(px.shape[0], dtype=np.bool_)
+    for i in range(px.shape[0]):
+        x = px[i]
+        y = py[i]
+        for j in range(n):
+            # Get the current and next vertex
+            x1 = vx[j]
+            y1 = vy[j]
+            x2 = vx[(j + 1) % n]
+            y2 = vy[(j + 1) % n]
+            # Check if the ray intersects the edge
+            if ((y1 > y) != (y2 > y)) and (x < (x2 - x1) * (y - y1) / (y2 - y1 + 1e-12) + x1):
+                inside[i] = not inside[i]
+    return inside
+
+if njit is not None:
+    _ray_cast = njit(cache=True)(_ray_cast)
+
+
+_resize_buffer = threading.local() # The `BytesIO` reused by `resize_image` in each thread
+
+
+
 # Base class to extrapolate information from a selected region of a PDF page.
 class BaseSelectionHandler:
     """
@@ -49,15 +91,18 @@ class BaseSelectionHandler:
     or the user cancelled the dialog.
     """
     
-    # Constants for selection modes
-    SELECT_POLY = "Polynomial" 
-    SELECT_RECT = "Rectangular"
+    # Constants for selection modes (integers since they are compared at each mouse event)
+    SELECT_POLY = 0
+    SELECT_RECT = 1
+    
+    THUMBNAIL_RESAMPLE = Image.BILINEAR # The filter used by `resize_image` (e.g., `Image.BICUBIC` is sharper but slower)
     
       
     def __init__(self, main_view: 'PDFAnnotationTool', MAX_SIZE=512):
         self.main_view = main_view # Reference to `MainWindow` instance
         self.MAX_SIZE = MAX_SIZE # Maximum size of the screenshot in pixels
         self.last_title_id = None # Keep track of the last title selected to preselect it in the next selection dialog
+        self._extraction_executor = ThreadPoolExecutor(max_workers=1) # Extract text while the user fills the `SelectionDialog` (a single thread since PyMuPDF is not thread safe)
 
 
     def process_selection(self, selection: SelectableRegionItem) -> SelectionData: 
@@ -72,26 +117,31 @@ class BaseSelectionHandler:
         if BaseSelectionHandler._is_region_small(coords):
             return None
         
+        # Get the current page number and page object
+        page_num = self.main_view.get_page_num()
+        page = self.main_view.get_doc_page()
+        
         # Ask the user to input selection metadata such as category, id, parent, and image resolution.
         dlg = SelectionDialog(self.main_view, self.last_title_id, initial_selection=self.main_view.selection_to_redraw) #, parent=, default_img_resolution=) 
-        if dlg.exec_():
+        
+        # Meanwhile, copy-paste the available text
+        text_future = self._extraction_executor.submit(self.extract_text, page, coords)
+        accepted = dlg.exec_()
+        wait([text_future]) # The document should not be accessed by the GUI while extracting
+        
+        if accepted:
             user_spec = dlg.get_results() # get user specification as SelectionUserSpecific`
-            
-            # Get the current page number and page object
-            page_num = self.main_view.get_page_num()
-            page = self.main_view.get_doc_page()
                         
-            # take a screenshot of the PDF page based on the selected area and resize it.
+            # take a screenshot of the PDF page based on the selected area and the image resolution given by the user.
             try:
-                img = self.extract_image(page, coords)
+                img = self.extract_image(page, coords, user_spec.image_resolution)
                 img_str = BaseSelectionHandler.resize_image(img, user_spec.image_resolution)
             except Exception:
                 traceback.print_exc()
                 QMessageBox.warning(self, "Error", "Error taking selection, no data stored.")
                 return None
             
-            # Copy-paste the available text
-            text = self.extract_text(page, coords)
+            text = text_future.result()
                 
             # Take track of previous titles and containers selection to preselect the node for the next selection
             if user_spec.category == SelectionCategory.TITLE or user_spec.category == SelectionCategory.CONTAINER:
@@ -125,9 +175,9 @@ class BaseSelectionHandler:
 
 
     @abc.abstractmethod
-    def extract_image(self, page: fitz.Page, coords: List[Tuple[float, float]]) -> ImageFile:
-        """Return PIL image extracted from the selection shape, i.e., based on `coords`.
-        The `page` is a PyMuPDF page object. It must be implemented in subclasses."""
+    def extract_image(self, page: fitz.Page, coords: List[Tuple[float, float]], image_resolution: Optional[Tuple[int, int]] = None) -> ImageFile:
+        """Return PIL image extracted from the selection shape, i.e., based on `coords`. If `image_resolution` (`(width, height)`) is given, 
+        the image can be rendered directly within it. The `page` is a PyMuPDF page object. It must be implemented in subclasses."""
         
         raise NotImplementedError
 
@@ -144,8 +194,11 @@ class BaseSelectionHandler:
     def _is_region_small(points: List[Tuple[float, float]], threshold: float=2) -> bool:
         """Check if the selected region is too small to be considered, i.e., if the region area compute in a list of `points` (i.e., `[[x0,y0],[x1,y1],...]`) is below a given `threshold`."""
         
-        poly = Polygon(points)
-        return poly.area < threshold
+        # Shoelace formula
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        xs, ys = pts[:, 0], pts[:, 1]
+        area = 0.5 * abs(np.dot(xs, np.roll(ys, -1)) - np.dot(ys, np.roll(xs, -1)))
+        return area < threshold
 
 
     @staticmethod
@@ -153,10 +206,18 @@ class BaseSelectionHandler:
        
         """Resize the image `img` to `image_resolution` (`(width, height)`) if it is bigger than the resolution itself. It maintain aspect ratio, and return the image as a base64-encoded PNG string."""
         # Resize the screenshot maintaining aspect ratio (does noting if size is less than `image_resolution`)
-        img.thumbnail(image_resolution) # i.e., `(self.MAX_SIZE, self.MAX_SIZE)`
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
+        img.thumbnail(image_resolution, BaseSelectionHandler.THUMBNAIL_RESAMPLE) # i.e., `(self.MAX_SIZE, self.MAX_SIZE)`
+        # Drop the alpha channel if it is fully opaque (e.g., rectangular selections) since there is less data to compress
+        if img.mode == "RGBA" and img.getchannel("A").getextrema()[0] == 255:
+            img = img.convert("RGB")
+        buffered = getattr(_resize_buffer, "buffer", None)
+        if buffered is None:
+            buffered = _resize_buffer.buffer = BytesIO()
+        buffered.seek(0)
+        buffered.truncate()
+        img.save(buffered, format="PNG", compress_level=1) # Fastest compression, the image is stored as base64 anyway
+        with buffered.getbuffer() as data: # Encode the buffer content without copying it (and release it before the buffer is reused)
+            img_str = base64.b64encode(data).decode("ascii")
         return img_str
 
 
@@ -164,39 +225,60 @@ class BaseSelectionHandler:
 class PolySelectionHandler(BaseSelectionHandler):
     """Specialization of `BaseSelectionHandler` for polynomial-based selections."""
     
-    def extract_image(self, page: fitz.Page, coords: List[Tuple[float, float]]) -> ImageFile:
+    # Characters of the last parsed pages, i.e., `{(document_name, page_number): (chars, boxes, line_ids)}`, see `_get_page_chars`
+    _page_chars_cache = OrderedDict()
+    PAGE_CHARS_CACHE_SIZE = 8 # Maximum number of pages stored in `_page_chars_cache`
+    
+    
+    def extract_image(self, page: fitz.Page, coords: List[Tuple[float, float]], image_resolution: Optional[Tuple[int, int]] = None) -> ImageFile:
         """Extract image based on polygonal selection. This method is required by `BaseSelectionHandler` and based on `extract_poly_image`."""
         
-        return PolySelectionHandler.extract_poly_image(page, coords)
+        return PolySelectionHandler.extract_poly_image(page, coords, max_size=image_resolution)
 
 
     @staticmethod
-    def extract_poly_image(page: fitz.Page, points: List[Tuple[float, float]]) -> ImageFile:  # Takes a screenshot based on the polygon in the PDF space with a zoom of 1:1
+    def extract_poly_image(page: fitz.Page, points: List[Tuple[float, float]], max_size: Optional[Tuple[int, int]] = None,
+                           display_list: Optional[fitz.DisplayList] = None) -> ImageFile:  # Takes a screenshot based on the polygon in the PDF space with a zoom of 1:1
         """Take a screenshot of the `page` based on the polygon defined by `points` (i.e., `[[x0,y0],[x1,y1],...]`) in PDF space with a zoom factor of `1:1`.
-        It returns a PIL image with transparent background outside the polygon."""
+        If the screenshot would be bigger than `max_size` (`(width, height)`), the page is rendered with the smaller zoom factor that fits it, 
+        which is cheaper than resizing it afterwards. It returns a PIL image with transparent background outside the polygon.
+        If many screenshots are taken from the same page, the `display_list` of the `page` (i.e., `page.get_displaylist()`) can be given 
+        to avoid interpreting the page content for each of them."""
         
         # Retrieve bounding box of the polygon
-        min_x = min(x for x, _ in points)
-        max_x = max(x for x, _ in points)
-        min_y = min(y for _, y in points)
-        max_y = max(y for _, y in points)
+        min_x, min_y, max_x, max_y = PolySelectionHandler.get_bounding_box(points)
         bbox = fitz.Rect(min_x, min_y, max_x, max_y)
+        
+        # Zoom factor that keeps the screenshot within `max_size` while maintaining aspect ratio
+        scale = 1.0
+        if max_size is not None and bbox.width > 0 and bbox.height > 0:
+            scale = min(max_size[0] / bbox.width, max_size[1] / bbox.height, 1.0)
 
         # Take screenshot of the bounding box
-        pix = page.get_pixmap(matrix=fitz.Matrix(1, 1), clip=bbox)
+        if display_list is None:
+            display_list = page.get_displaylist() # As done by `page.get_pixmap`
+        pix = display_list.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=fitz.csRGB, clip=bbox, alpha=False) # RGB samples, the alpha channel is given by the polygon
         if pix.w <= 0 or pix.h <= 0:
             print(f"Skipping invalid page {page.number}")
             return None
-        img = Image.open(BytesIO(pix.tobytes("png"))).convert("RGBA")
 
-        # Mask polygon and set background outside polygon to transparent
-        mask = Image.new("L", img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        shifted_points = [(x - min_x, y - min_y) for x, y in points]
-        draw.polygon(shifted_points, fill=255)
-        img.putalpha(mask)
+        # Mask polygon
+        shifted_points = [((x - min_x) * scale, (y - min_y) * scale) for x, y in points]
+        if cv2 is not None:
+            mask = np.zeros((pix.h, pix.w), dtype=np.uint8)
+            cv2.fillPoly(mask, [np.round(np.asarray(shifted_points) * 16).astype(np.int32)], 255, shift=4) # Points with 4 fractional bits
+        else:
+            mask = Image.new("L", (pix.w, pix.h), 0)
+            draw = ImageDraw.Draw(mask)
+            draw.polygon(shifted_points, fill=255)
 
-        return img
+        # Compose the RGBA image directly from the pixmap samples (without copying them), where the background outside polygon is transparent
+        samples = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
+        rgba = np.empty((pix.h, pix.w, 4), dtype=np.uint8)
+        rgba[..., :3] = samples
+        rgba[..., 3] = np.asarray(mask)
+
+        return Image.fromarray(rgba, "RGBA")
 
 
     def extract_text(self, page: fitz.Page, coords: List[Tuple[float, float]]) -> str:
@@ -214,10 +296,67 @@ class PolySelectionHandler(BaseSelectionHandler):
         Returns the extracted text as a string.
         """
         
+        # Get the characters of the page (parsed only once per page)
+        chars, boxes, line_ids = PolySelectionHandler._get_page_chars(page)
+
+        # Check at once which character centers are inside the polygon
+        selected = np.flatnonzero(PolySelectionHandler.points_in_polygon(boxes[:, 2:4], coords))
+
+        text_lines = []
+        line_chars = []
+        prev_line_id = None
+        prev_x2 = None  # right edge of previous char
+        prev_width = None
+        for idx, line_id, x0, x1 in zip(selected.tolist(), line_ids[selected].tolist(), boxes[selected, 0].tolist(), boxes[selected, 1].tolist()):
+            # Start a new line
+            if line_id != prev_line_id:
+                text_lines.append("".join(line_chars))
+                line_chars = []
+                prev_line_id = line_id
+                prev_x2 = None
+                prev_width = None
+
+            char_width = x1 - x0
+
+            # Insert space if there's a significant gap from the previous character
+            if prev_x2 is not None:
+                gap = x0 - prev_x2
+                
+                # Decide if gap is big enough to count as a space
+                if gap > (space_threshold * (prev_width or char_width)): # if gap > 5:  # 5 points in PDF coordinates
+                    line_chars.append(" ")
+
+            # Append the character
+            line_chars.append(chars[idx])
+            prev_x2 = x1
+            prev_width = char_width
+
+        text_lines.append("".join(line_chars))
+
+        return "\n".join(l.strip() for l in text_lines if l.strip())
+
+
+    @staticmethod
+    def _get_page_chars(page: fitz.Page) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Return the characters of the `page` as flat arrays, i.e., the list of characters, the `(N, 4)` array with their `(x0, x1, cx, cy)`
+        coordinates (where `(cx, cy)` is the center point), and the `N` array with the index of the line they belong to. 
+        Since `page.get_text("rawdict")` parses the whole page, the result is cached for the last `PAGE_CHARS_CACHE_SIZE` pages, 
+        and it should be cleared with `clear_page_chars_cache` when a new document is loaded."""
+        
+        key = (page.parent.name, page.number)
+        cache = PolySelectionHandler._page_chars_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
         # Get the raw text dictionary from the page
         rawdict = page.get_text("rawdict")
-        text_lines = []
 
+        # Collect all characters together with their coordinates and line
+        chars = []
+        boxes = []
+        line_ids = []
+        line_id = 0
         for block in rawdict["blocks"]:
             if "lines" not in block:
                 # Skip non-text blocks
@@ -225,51 +364,67 @@ class PolySelectionHandler(BaseSelectionHandler):
 
             # Process each line in the text block
             for line in block["lines"]:
-                line_chars = []
-                prev_x2 = None  # right edge of previous char
-                prev_width = None
-
                 for span in line["spans"]:
                     for ch in span["chars"]:
-                        # Character center point
-                        cx = (ch["bbox"][0] + ch["bbox"][2]) / 2
-                        cy = (ch["bbox"][1] + ch["bbox"][3]) / 2
-
-                        # Check if the character center is inside the polygon
-                        if PolySelectionHandler.point_in_polygon(cx, cy, coords):
-                            x0, _, x1, _ = ch["bbox"]
-                            char_width = x1 - x0
-
-                            # Insert space if there's a significant gap from the previous character
-                            if prev_x2 is not None:
-                                gap = x0 - prev_x2
-                                
-                                # Decide if gap is big enough to count as a space
-                                if gap > (space_threshold * (prev_width or char_width)): # if gap > 5:  # 5 points in PDF coordinates
-                                    line_chars.append(" ")
-
-                            # Append the character
-                            line_chars.append(ch["c"])
-                            prev_x2 = x1
-                            prev_width = char_width
+                        x0, y0, x1, y1 = ch["bbox"]
+                        chars.append(ch["c"])
+                        boxes.append((x0, x1, (x0 + x1) / 2, (y0 + y1) / 2))
+                        line_ids.append(line_id)
+                line_id += 1
+        
+        # Store the result and forget the least recently used page
+        cache[key] = (chars, np.asarray(boxes, dtype=np.float64).reshape(-1, 4), np.asarray(line_ids, dtype=np.int64))
+        if len(cache) > PolySelectionHandler.PAGE_CHARS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return cache[key]
+    
+    
+    @staticmethod
+    def clear_page_chars_cache() -> None:
+        """Forget the characters cached by `_get_page_chars`. It is called by `PDFAnnotationTool` when a new PDF is loaded."""
+        
+        PolySelectionHandler._page_chars_cache.clear()
 
-                text_lines.append("".join(line_chars))
 
-        return "\n".join(l.strip() for l in text_lines if l.strip())
+    @staticmethod
+    def points_in_polygon(points: np.ndarray, polygon: List[Tuple[float, float]]) -> np.ndarray:
+        """Ray casting algorithm for point-in-polygon check. It takes `points` as a `(N, 2)` array and returns a boolean array of `N` elements,
+        which are `True` if the related point is inside the `polygon`, which is a list of points `[[x0,y0], [x1,y1], ...]`."""
+        
+        # Only points within the bounding box of the polygon can be inside it
+        min_x, min_y, max_x, max_y = PolySelectionHandler.get_bounding_box(polygon)
+        px = points[:, 0]
+        py = points[:, 1]
+        inside = (px >= min_x) & (px <= max_x) & (py >= min_y) & (py <= max_y)
+        candidates = np.flatnonzero(inside)
+        if candidates.size == 0:
+            return inside
+        
+        # Polygon vertices
+        vx = np.asarray([p[0] for p in polygon], dtype=np.float64)
+        vy = np.asarray([p[1] for p in polygon], dtype=np.float64)
+        
+        # Use the compiled ray casting, if available
+        if njit is not None:
+            inside[candidates] = _ray_cast(px[candidates], py[candidates], vx, vy)
+            return inside
+        
+        # Otherwise, consider the next vertex of each vertex, i.e., the polygon edges
+        vx2 = np.roll(vx, -1)
+        vy2 = np.roll(vy, -1)
+        
+        # Ray casting of the candidate points (rows) against all edges (columns)
+        cx = px[candidates, None]
+        cy = py[candidates, None]
+        crossing = ((vy > cy) != (vy2 > cy)) & (cx < (vx2 - vx) * (cy - vy) / (vy2 - vy + 1e-12) + vx)
+        inside[candidates] = np.bitwise_xor.reduce(crossing, axis=1)
+        return inside
 
 
     @staticmethod
-    def point_in_polygon(x: float, y: float, polygon: List[Tuple[float, float]]) -> bool:
-        """Ray casting algorithm for point-in-polygon check. Returns True if the point (x, y) is inside the `polygon`, which is a list of points `[[x0,y0], [x1,y1], ...]`."""
+    def get_bounding_box(points: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
+        """Return the bounding box `(min_x, min_y, max_x, max_y)` of the polygon defined by `points`, i.e., `[[x0,y0], [x1,y1], ...]`."""
         
-        inside = False
-        n = len(polygon)
-        px, py = x, y
-        for i in range(n):
-            # Get the current and next vertex
-            x1, y1 = polygon[i]
-            x2, y2 = polygon[(i + 1) % n]
-            # Check if the ray intersects the edge
-            if ((y1 > py) != (y2 > py)) and (px < (x2 - x1) * (py - y1) / (y2 - y1 + 1e-12) + x1):
-                inside = not inside
-        return inside
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return min(xs), min(ys), max(xs), max(ys)
@@ -21,7 +21,7 @@
 
 from typing import TYPE_CHECKING
 
-from PyQt5.QtWidgets import QGraphicsView, QGraphicsRectItem, QGraphicsLineItem, QGraphicsPolygonItem, QMessageBox
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsRectItem, QGraphicsLineItem, QMessageBox
 from PyQt5.QtGui import QPen, QColor, QPolygonF, QMouseEvent, QKeyEvent
 from PyQt5.QtCore import Qt, QRectF, QPointF
 
@@ -52,6 +52,7 @@ class SelectableGraphicsView(QGraphicsView):
         # Class properties
         self.main_view = main_view
         self._last_selected_index = -1 # Store cycling array to manipulate focus and select polygon that are not on foreground
+        self._next_z = 2 # The z-value given to the last polygon brought to the front, it is above all the other items in the scene
         self.poly_selection_handler = PolySelectionHandler(main_view)  # Initialize the class that extracts data from polygonal selections        
         self.main_view.mode_selector.currentIndexChanged.connect(self._on_drawing_shape_changed) # Trigger function when user changes drawing shape form rectangular to polygonal  (TODO Use QSignalConnect selection mode change signal instead of accessing main_view directly)
         self.selected_shape = self.main_view.mode_selector.itemData(0) # Initialize the selected shape based on the first item in the mode selector (i.e., rectangular)
@@ -89,7 +90,7 @@ class SelectableGraphicsView(QGraphicsView):
         # State restored at each new selection
         self.origin = QPointF() # Starting point for rectangle selection
         self.is_selecting = False # Flag to indicate if a rectangle selection is in progress
-        self.polygon_points = [] # List of points for polygon selection
+        self.polygon_points = QPolygonF() # Points for polygon selection, kept as a `QPolygonF` to avoid converting them at each new point
         self.polygon_selecting = False # Flag to indicate if a polygon selection is in progress
         
         
@@ -104,25 +105,14 @@ class SelectableGraphicsView(QGraphicsView):
         
         # Map the mouse position to scene coordinates
         point = self.mapToScene(pose)
-        pixmap = self.main_view.get_doc_page().get_pixmap()
         
-        # Get the maximum x and y coordinates based on the pixmap size and zoom level
-        img_max_x = pixmap.width * self.main_view.pdf_zoom
-        img_max_y = pixmap.height * self.main_view.pdf_zoom
-        
-        # Clamp the point coordinates to be within the image bounds
-        if point.x() < 0:
-            point.setX(0)
-        elif point.x() > img_max_x:
-            point.setX(img_max_x)
-            
-        if point.y() < 0:
-            point.setY(0)
-        elif point.y() > img_max_y:
-            point.setY(img_max_y)
+        # Clamp the point coordinates to be within the page bounds (given by `PDFAnnotationTool` based on the zoom level)
+        page_max_x, page_max_y = self.main_view.page_rect_scene
+        x = max(0.0, min(page_max_x, point.x()))
+        y = max(0.0, min(page_max_y, point.y()))
         
         # Return clamped point
-        return point
+        return QPointF(x, y)
         
     
     def mousePressEvent(self, event: QMouseEvent) -> None:
@@ -141,8 +131,7 @@ class SelectableGraphicsView(QGraphicsView):
             if event.button() == Qt.LeftButton:
                 point = self.make_points_within_page(event.pos())
                 self.polygon_points.append(point)
-                poly = QPolygonF(self.polygon_points)
-                self.selection_poly.setPolygon(poly)
+                self.selection_poly.setPolygon(self.polygon_points)
                 self.selection_poly.show()
                 self.polygon_selecting = True
                 self.temp_line.show()
@@ -160,11 +149,12 @@ class SelectableGraphicsView(QGraphicsView):
             self.selection_rect.setRect(rect)
 
         # Update polygon selection preview line
-        elif self.selected_shape == BaseSelectionHandler.SELECT_POLY and self.polygon_selecting and self.polygon_points:
+        elif self.selected_shape == BaseSelectionHandler.SELECT_POLY and self.polygon_selecting and not self.polygon_points.isEmpty():
             current_pos = self.make_points_within_page(event.pos())
+            last_point = self.polygon_points.last()
             self.temp_line.setLine(
-                self.polygon_points[-1].x(),
-                self.polygon_points[-1].y(),
+                last_point.x(),
+                last_point.y(),
                 current_pos.x(),
                 current_pos.y()
             )
@@ -197,8 +187,8 @@ class SelectableGraphicsView(QGraphicsView):
         # Map the mouse position to scene coordinates
         pos = self.mapToScene(event.pos())
 
-        # Get all QGraphicsPolygonItems under the mouse (top-most first)
-        items = [i for i in self.scene().items(pos) if isinstance(i, QGraphicsPolygonItem)]
+        # Get all SelectablePolyItems under the mouse (top-most first)
+        items = [i for i in self.scene().items(pos) if i.type() == SelectablePolyItem.Type]
         if not items:
             return
 
@@ -217,8 +207,8 @@ class SelectableGraphicsView(QGraphicsView):
         items[index].setSelected(True)
 
         # Bring it to the front so highlight is visible
-        z_top = max([i.zValue() for i in self.scene().items()]) + 1
-        items[index].setZValue(z_top)
+        self._next_z += 1
+        items[index].setZValue(self._next_z)
 
         # Update the item to reflect selection changes
         items[index].update()
@@ -282,6 +272,7 @@ class SelectableGraphicsView(QGraphicsView):
         """Reject the current polygon selection, clearing the points and hiding the polygon item."""
         
         self.selection_poly.setPolygon(QPolygonF())
+        self.polygon_points.clear()
         self.selection_poly.hide()
         
         
@@ -31,9 +31,6 @@ from pathlib import Path
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QGridLayout, QSplitter, QHBoxLayout, QTextEdit, QLabel, QPushButton, QCheckBox, QLineEdit, QMessageBox, QProgressBar, QComboBox, QWidget, QDoubleSpinBox, QSpinBox
 from PyQt5.QtCore import Qt, pyqtSignal, QThread
 
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage
-
 from pdf_annotation_tool.manipulation.editor import SelectionDataEditingWidget
 from pdf_annotation_tool.selection.data import SelectionCategory, SelectionData
 from pdf_annotation_tool.selection.manager import SelectionsManager
@@ -147,6 +144,10 @@ class LlmWorker(QThread):
         The results are given as an `LlmOutput` object streamed through a signal within `self.finish`.
         """
         
+        # Imported here since LangChain is slow to load and only needed when invoking the LLM
+        from langchain_openai import ChatOpenAI
+        from langchain.schema import HumanMessage
+        
         # Prepare the message content
         content = []
         if self.llm_inputs.prompt:
@@ -19,27 +19,74 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 # -----------------------------------------------------------------------------
 
-from typing import List, Tuple
-from PyQt5.QtWidgets import QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTextEdit, QComboBox, QSplitter, QSizePolicy, QFrame, QDialogButtonBox, QSpacerItem
+from functools import lru_cache
+import numpy as np
+from typing import Dict, List, Tuple
+from PyQt5.QtWidgets import QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPlainTextEdit, QComboBox, QSplitter, QSizePolicy, QFrame, QDialogButtonBox, QSpacerItem, QScrollArea
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFontMetrics
-import copy
+from PyQt5.QtGui import QFontMetrics, QShowEvent
 
 from pdf_annotation_tool.selection.data import SelectionData, SelectionCategory
 from pdf_annotation_tool.utils.image import ImageWindow
 
+
+# The `(name, category)` items of the category combo box, computed once since `SelectionCategory` does not change
+_CATEGORY_ITEMS: Tuple[Tuple[str, SelectionCategory], ...] = tuple((cat.value.name, cat) for cat in SelectionCategory)
+
+_LBL_ALIGN = Qt.AlignVCenter | Qt.AlignLeft # The alignment of the labels on the left of each row
+_ROW_MARGINS = (4, 2, 4, 2) # The contents margins of each row
+
+_EMPTY_FIELD = "—" # The text shown by read-only fields without a value
+
+_LARGE_COORDS_SIZE = 256 # The number of coordinates above which `_format_coords` formats all of them at once
+
+
+@lru_cache(maxsize=512)
+def _format_str_list(l: Tuple, tab: str) -> str:
+    """Cached implementation of `SelectionDataEditingWidget.format_str_list`, where `l` is given as a tuple to be hashable."""
+    
+    if not l:
+        return ""
+    if len(l) == 1:
+        return f"[ {l[0]} ]"
+    return "[\n" + ",\n".join(f"{tab}{i}" for i in l) + "\n]"
+
+
+@lru_cache(maxsize=512)
+def _format_coords(coords: Tuple[Tuple[float, float], ...]) -> str:
+    """Cached implementation of `SelectionDataEditingWidget.format_coords`, where `coords` is given as a tuple of tuples to be hashable."""
+    
+    if not coords:
+        return ""
+    if len(coords) == 1:
+        return f"[ {coords[0][0]:.2f} , {coords[0][1]:.2f} ]"
+    if len(coords) > _LARGE_COORDS_SIZE:
+        # Format all the values with a single operation instead of an f-string for each point
+        template = ",\n".join(["   %.2f , %.2f"] * len(coords))
+        return "[\n" + template % tuple(np.asarray(coords, dtype=np.float64).ravel().tolist()) + "\n]"
+    return _format_str_list(
+        tuple(f"{x:.2f} , {y:.2f}" for x, y in coords), "   "
+    )
+
+
 class SelectionDataEditingWidget(QWidget):
     """
     Purely graphical widget showing `SelectionData` fields, and allows some data modification.
     No dialog buttons, no accept/reject, just the layout. It is used inside `SelectionDataEditingDialog` and `AugmentInteractiveDialog`.
     """
     
+    # The line spacing of each font used by the widgets, i.e., `{font_key: line_spacing}`, see `_line_spacing`
+    _line_spacing_cache: Dict[str, int] = {}
+    
     def __init__(self, selection_data: SelectionData, parent: QWidget=None, show_description: bool=True):
         super().__init__(parent)
         
         # Class properties
         self.selection_data = selection_data # Original data, not modified
         self.show_description = show_description # Whether to show the description field or not (It is not needed by `AugmentInteractiveDialog``)
+        
+        # Avoid repainting while building the widgets (enabled again at the end of the constructor)
+        self.setUpdatesEnabled(False)
 
         # MAIN SPLITTER: left fields | right image
         main_splitter = QSplitter(Qt.Horizontal, self)
@@ -50,28 +97,18 @@ class SelectionDataEditingWidget(QWidget):
         left_splitter = QSplitter(Qt.Vertical)
         left_splitter.setMinimumWidth(200)
 
-        # --- Helper for row with label ---
-        def _make_row_widget(label_text: str, widget: QWidget) -> QWidget:
-            row = QWidget()
-            h = QHBoxLayout(row)
-            h.setContentsMargins(4, 2, 4, 2)
-            h.setSpacing(8)
-            lbl = QLabel(label_text)
-            lbl.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-            h.addWidget(lbl)
-            h.addWidget(widget)
-            return row
-
         # --- TOP non-editable fields ---
-        top_splitter = QSplitter(Qt.Vertical)
+        top_container = QWidget()
+        top_layout = QVBoxLayout(top_container)
+        top_layout.setContentsMargins(0, 0, 0, 0)
 
         self.id_edit = QLineEdit(selection_data.id_)
         self._prepare_line(self.id_edit, read_only=True)
-        top_splitter.addWidget(_make_row_widget("ID:", self.id_edit))
+        top_layout.addWidget(self._make_row("ID:", self.id_edit))
 
         self.doc_edit = QLineEdit(selection_data.doc)
         self._prepare_line(self.doc_edit, read_only=True)
-        top_splitter.addWidget(_make_row_widget("Document:", self.doc_edit))
+        top_layout.addWidget(self._make_row("Document:", self.doc_edit))
 
         self.page_edit = QLineEdit(str(selection_data.page))
         self._prepare_line(self.page_edit, read_only=True)
@@ -80,7 +117,7 @@ class SelectionDataEditingWidget(QWidget):
 
         page_idx_row = QWidget()
         page_idx_layout = QHBoxLayout(page_idx_row)
-        page_idx_layout.setContentsMargins(4, 2, 4, 2)
+        page_idx_layout.setContentsMargins(*_ROW_MARGINS)
         page_idx_layout.setSpacing(6)
         page_idx_layout.addWidget(QLabel("Page:"))
         page_idx_layout.addWidget(self.page_edit)
@@ -88,33 +125,26 @@ class SelectionDataEditingWidget(QWidget):
         page_idx_layout.addWidget(QLabel("Index:"))
         page_idx_layout.addWidget(self.idx_edit)
         page_idx_layout.addStretch()
-        top_splitter.addWidget(page_idx_row)
+        top_layout.addWidget(page_idx_row)
 
-        self.coords_edit = QTextEdit(
-            SelectionDataEditingWidget.format_coords(selection_data.coords)
+        # Empty fields are shown with a placeholder and without scroll area
+        self.coords_edit = QLabel(
+            SelectionDataEditingWidget.format_coords(selection_data.coords) or _EMPTY_FIELD
         )
-        self._prepare_text(self.coords_edit, read_only=True, min_lines=6)
-        top_splitter.addWidget(_make_row_widget("Coords:", self.coords_edit))
+        self._prepare_label(self.coords_edit)
+        top_layout.addWidget(self._make_row("Coords:", self._make_scrollable(self.coords_edit, min_lines=6) if selection_data.coords else self.coords_edit))
 
-        self.parent_edit = QTextEdit(str(selection_data.parent))
-        self._prepare_text(self.parent_edit, read_only=True, min_lines=1)
-        top_splitter.addWidget(_make_row_widget("Parent:", self.parent_edit))
+        self.parent_edit = QLineEdit(str(selection_data.parent) if selection_data.parent else _EMPTY_FIELD)
+        self._prepare_line(self.parent_edit, read_only=True)
+        top_layout.addWidget(self._make_row("Parent:", self.parent_edit))
 
-        self.children_edit = QTextEdit(
-            SelectionDataEditingWidget.format_str_list(selection_data.children)
+        self.children_edit = QLabel(
+            SelectionDataEditingWidget.format_str_list(selection_data.children) or _EMPTY_FIELD
         )
-        self._prepare_text(self.children_edit, read_only=True, min_lines=6)
-        top_splitter.addWidget(_make_row_widget("Children:", self.children_edit))
+        self._prepare_label(self.children_edit)
+        top_layout.addWidget(self._make_row("Children:", self._make_scrollable(self.children_edit, min_lines=6) if selection_data.children else self.children_edit))
 
-        # Separator
-        top_container = QWidget()
-        top_layout = QVBoxLayout(top_container)
-        top_layout.setContentsMargins(0, 0, 0, 0)
-        top_layout.addWidget(top_splitter)
-        sep = QFrame()
-        sep.setFrameShape(QFrame.HLine)
-        sep.setFrameShadow(QFrame.Sunken)
-        top_layout.addWidget(sep)
+        top_layout.addWidget(self._hline())
         left_splitter.addWidget(top_container)
 
         # --- Category ---
@@ -123,14 +153,11 @@ class SelectionDataEditingWidget(QWidget):
         cat_h.setContentsMargins(6, 4, 6, 4)
         cat_label = QLabel("Category:")
         self.category_combo = QComboBox()
-        for cat in SelectionCategory:
-            self.category_combo.addItem(cat.value.name, cat)
-        try:
-            self.category_combo.setCurrentIndex(
-                list(SelectionCategory).index(selection_data.category)
-            )
-        except Exception:
-            pass
+        for name, cat in _CATEGORY_ITEMS:
+            self.category_combo.addItem(name, cat)
+        category_idx = self.category_combo.findData(selection_data.category)
+        if category_idx >= 0:
+            self.category_combo.setCurrentIndex(category_idx)
         cat_h.addWidget(cat_label)
         cat_h.addWidget(self.category_combo)
         cat_h.addStretch()
@@ -139,7 +166,7 @@ class SelectionDataEditingWidget(QWidget):
         # --- Text + Description ---
         inner_splitter = QSplitter(Qt.Vertical)
         
-        self.text_edit = QTextEdit()
+        self.text_edit = QPlainTextEdit()
         self.text_edit.setPlainText(selection_data.text)
         self._prepare_text(self.text_edit, min_lines=10)
         text_panel = QWidget()
@@ -150,7 +177,7 @@ class SelectionDataEditingWidget(QWidget):
         inner_splitter.addWidget(text_panel)
 
         if show_description:
-            self.description_edit = QTextEdit()
+            self.description_edit = QPlainTextEdit()
             self.description_edit.setPlainText(selection_data.description)
             self._prepare_text(self.description_edit, min_lines=10)
             desc_panel = QWidget()
@@ -166,20 +193,18 @@ class SelectionDataEditingWidget(QWidget):
         # -----------------------------
         # RIGHT: image
         # -----------------------------
-        right_splitter = QSplitter(Qt.Horizontal)
-        if getattr(selection_data, "image", None):
-            try:
-                self.image_window = ImageWindow(selection_data.image, self)
-                right_splitter.addWidget(self.image_window)
-            except Exception as e:
-                right_splitter.addWidget(QLabel(f"[Error loading image: {e}]"))
+        self._main_splitter = main_splitter
+        self._image_built = not getattr(selection_data, "image", None) # The image is built by `_build_image` when this widget is shown
+        if self._image_built:
+            main_splitter.addWidget(QLabel("No image available"))
         else:
-            right_splitter.addWidget(QLabel("No image available"))
-        main_splitter.addWidget(right_splitter)
+            main_splitter.addWidget(QLabel("Loading image..."))
 
         # MAIN LAYOUT
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(main_splitter)
+        
+        self.setUpdatesEnabled(True)
 
         #try:
         #    main_splitter.setSizes([300, 700])
@@ -189,10 +214,45 @@ class SelectionDataEditingWidget(QWidget):
         #    pass
 
 
+    def showEvent(self, event: QShowEvent) -> None:
+        """Build the image the first time this widget is shown."""
+        
+        super().showEvent(event)
+        if not self._image_built:
+            self._build_image()
+
+
+    def _build_image(self) -> None:
+        """Replace the placeholder on the right-hand side with the `ImageWindow` showing the selection image."""
+        
+        self._image_built = True
+        try:
+            self.image_window = ImageWindow(self.selection_data.image, self)
+            new_widget = self.image_window
+        except Exception as e:
+            new_widget = QLabel(f"[Error loading image: {e}]")
+        placeholder = self._main_splitter.replaceWidget(1, new_widget)
+        placeholder.deleteLater()
+        
+        # Share the space as if the image was there from the beginning
+        self._main_splitter.setSizes([self._main_splitter.widget(0).sizeHint().width(), new_widget.sizeHint().width()])
+
+
+    def is_edited(self) -> bool:
+        """Return whether the user changed any of the editable fields, i.e., category, text and description."""
+        
+        data = self.selection_data
+        if self.category_combo.currentData() != data.category:
+            return True
+        if self.text_edit.toPlainText() != data.text:
+            return True
+        return self.show_description and self.description_edit.toPlainText() != data.description
+
+
     def get_data(self) -> SelectionData:
         """Get the edited data as a new SelectionData object."""
         
-        edited_data = copy.deepcopy(self.selection_data)
+        edited_data = self.selection_data.fast_clone()
         edited_data.category = self.category_combo.currentData()
         edited_data.text = self.text_edit.toPlainText()
         if self.show_description:
@@ -205,42 +265,91 @@ class SelectionDataEditingWidget(QWidget):
         """Prepare a `widget`, i.e., set `read_only`, minimum height, and size policy."""
         
         widget.setReadOnly(read_only)
-        fm = QFontMetrics(widget.font())
-        widget.setMinimumHeight(fm.lineSpacing())# + 12)
+        widget.setMinimumHeight(SelectionDataEditingWidget._line_spacing(widget))# + 12)
         widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         
 
     @staticmethod
-    def _prepare_text(widget: QTextEdit , read_only: bool = False, min_lines=1) -> None:
+    def _prepare_text(widget: QPlainTextEdit, read_only: bool = False, min_lines=1) -> None:
         """Prepare a `widget`, i.e., set `read_only`, minimum height (with an heuristic `min_line`), and size policy."""
         
         widget.setReadOnly(read_only)
-        fm = QFontMetrics(widget.font())
-        widget.setMinimumHeight(fm.lineSpacing() * min_lines)# + 8)
+        widget.setMinimumHeight(SelectionDataEditingWidget._line_spacing(widget) * min_lines)# + 8)
+
+
+    @staticmethod
+    def _prepare_label(widget: QLabel) -> None:
+        """Prepare a read-only `widget`, i.e., show its text as plain text that can be selected and copied."""
+        
+        widget.setTextFormat(Qt.PlainText)
+        widget.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        widget.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+
+
+    @staticmethod
+    def _make_row(label_text: str, widget: QWidget) -> QWidget:
+        """Return a row widget with a `label_text` label on the left of `widget`."""
+        
+        row = QWidget()
+        h = QHBoxLayout(row)
+        h.setContentsMargins(*_ROW_MARGINS)
+        h.setSpacing(8)
+        lbl = QLabel(label_text)
+        lbl.setAlignment(_LBL_ALIGN)
+        h.addWidget(lbl)
+        h.addWidget(widget)
+        return row
+
+
+    @staticmethod
+    def _hline() -> QFrame:
+        """Return an horizontal line used as separator."""
+        
+        line = QFrame()
+        line.setFrameShape(QFrame.HLine)
+        line.setFrameShadow(QFrame.Sunken)
+        return line
+
+
+    @staticmethod
+    def _make_scrollable(widget: QWidget, min_lines: int = 1) -> QScrollArea:
+        """Return a scroll area containing `widget`, with a minimum height (with an heuristic `min_line`)."""
+        
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(widget)
+        scroll.setMinimumHeight(SelectionDataEditingWidget._line_spacing(widget) * min_lines)
+        return scroll
+
+
+    @staticmethod
+    def _line_spacing(widget: QWidget) -> int:
+        """Return the line spacing of the `widget` font. The `QFontMetrics` is computed only once for each font."""
+        
+        font = widget.font()
+        key = font.key()
+        line_spacing = SelectionDataEditingWidget._line_spacing_cache.get(key)
+        if line_spacing is None:
+            line_spacing = QFontMetrics(font).lineSpacing()
+            SelectionDataEditingWidget._line_spacing_cache[key] = line_spacing
+        return line_spacing
 
 
     @staticmethod
     def format_str_list(l: List, tab: str = "   ") -> str:
-        """Format a list of strings (or other types) into a pretty string representation (similar to JSON)."""
+        """Format a list of strings (or other types) into a pretty string representation (similar to JSON).
+        The result is cached since the same selection is usually shown more times."""
         
-        if not l:
-            return ""
-        if len(l) == 1:
-            return f"[ {l[0]} ]"
-        return "[\n" + "".join(f"{tab}{i},\n" for i in l)[:-2] + "\n]"
+        return _format_str_list(tuple(l), tab)
 
 
     @staticmethod
     def format_coords(coords: List[Tuple[float, float]]) -> str:
-        """Format a list of coordinates `[[x0, y0], [x1, y1], ...]` into a pretty string representation (similar to JSON)."""
+        """Format a list of coordinates `[[x0, y0], [x1, y1], ...]` into a pretty string representation (similar to JSON).
+        The result is cached since the same selection is usually shown more times."""
         
-        if not coords:
-            return ""
-        if len(coords) == 1:
-            return f"[ {coords[0][0]:.2f} , {coords[0][1]:.2f} ]"
-        return SelectionDataEditingWidget.format_str_list(
-            [f"{x:.2f} , {y:.2f}" for x, y in coords]
-        )
+        return _format_coords(tuple(map(tuple, coords)))
         
         
 
@@ -276,7 +385,7 @@ class SelectionDataEditingDialog(QDialog):
         """Handle the acceptance of the dialog, validating inputs and storing results.
         If no changes were made, the dialog is rejected instead."""
         
-        if self.edited_data != self.widget.get_data():
+        if self.widget.is_edited():
             self.is_edited = True
             self.edited_data = self.widget.get_data()
             super().accept()
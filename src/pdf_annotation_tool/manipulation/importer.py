@@ -19,38 +19,97 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 # -----------------------------------------------------------------------------
 
-import base64
+import os
+import signal
+import threading
 import traceback
 import fitz
+import numpy as np
 
-from PIL import Image
 from io import BytesIO
 
-from multiprocessing import Queue
+from collections import OrderedDict
+from multiprocessing import Pool, Queue
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from typing import List, Optional, Any, Dict, Tuple, TYPE_CHECKING
+from typing import BinaryIO, Callable, List, Optional, Any, Dict, Tuple, TYPE_CHECKING
 
 from PyQt5.QtWidgets import QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFileDialog, QLineEdit, QMessageBox, QDialog, QFrame, QDialogButtonBox
 from PyQt5.QtGui import QPolygonF
 from PyQt5.QtCore import QPointF
 
-from shapely import Polygon, unary_union
+from shapely import Polygon, polygons, union_all
+
+try:
+    from numba import njit # Optional JIT compiler for `_points_to_pdf`
+except ImportError:
+    njit = None
+try:
+    import orjson # Optional faster JSON (de)serialization of the Unstructured partitions
+except ImportError:
+    orjson = None
 
 from pdf_annotation_tool.builder.dialog import SelectionDialog
 from pdf_annotation_tool.builder.handler import BaseSelectionHandler, PolySelectionHandler
 from pdf_annotation_tool.utils.worker import ProgressingRunner
 if TYPE_CHECKING:
     from pdf_annotation_tool.tool import PDFAnnotationTool
-
-from unstructured.partition.pdf import partition_pdf
-from unstructured.documents.elements import Element
-from unstructured.staging.base import elements_to_json, elements_from_json
+    from unstructured.documents.elements import Element
 
 from pdf_annotation_tool.selection.data import SelectionCategory, SelectionData, UnstructuredCategory
 from pdf_annotation_tool.selection.graphic import SelectablePolyItem
 
 
 
+def _points_to_pdf(pts: np.ndarray, scale_x: float, scale_y: float, page_height: float, flip_y: bool) -> np.ndarray:
+    """Scale the `(N, 2)` points `pts` by `scale_x` and `scale_y`, and flip their `y` with respect to `page_height` if `flip_y`. 
+    It is compiled with Numba if available, see `UnstructuredImporter._coords_to_pdf`."""
+    
+    mapped = np.empty_like(pts)
+    for i in range(pts.shape[0]):
+        mapped[i, 0] = pts[i, 0] * scale_x
+        y = pts[i, 1] * scale_y
+        if flip_y:
+            y = page_height - y
+        mapped[i, 1] = y
+    return mapped
+
+if njit is not None:
+    _points_to_pdf = njit(cache=True, fastmath=True)(_points_to_pdf)
+
+
+def _load_elements(filepath: str) -> List['Element']:
+    """Implementation of `UnstructuredImporter.load_unstructured_results`, which parses the JSON with `orjson` when possible."""
+    
+    if orjson is not None:
+        try:
+            from unstructured.staging.base import elements_from_dicts # Imported here since it is slow to load (only in recent versions)
+        except ImportError:
+            pass
+        else:
+            with open(filepath, "rb") as f:
+                return elements_from_dicts(orjson.loads(f.read()))
+    from unstructured.staging.base import elements_from_json # Imported here since it is slow to load
+    return elements_from_json(filepath)
+
+
+def _write_elements_json(elements: List['Element'], file: BinaryIO) -> None:
+    """Write the Unstructured `elements` to the binary `file` as a UTF-8 JSON list (see `UnstructuredImporter.save_unstructured_partitions`).
+    With `orjson`, the elements are serialized and written one at a time, so only the JSON of one of them is in memory."""
+    
+    if orjson is not None:
+        file.write(b"[\n")
+        for i, elem in enumerate(elements):
+            if i > 0:
+                file.write(b",\n")
+            file.write(orjson.dumps(elem.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        file.write(b"\n]")
+        return
+    from unstructured.staging.base import elements_to_json # Imported here since it is slow to load
+    file.write((elements_to_json(elements) or "").encode("utf-8"))
+
+
+
 # Dialog to ask the user how to import Unstructured PDF partitions
 class UnstructuredDialog(QDialog):
     """
@@ -69,16 +128,22 @@ class UnstructuredDialog(QDialog):
     Methods:
         add_separator(layout): Adds a visual separator to the dialog layout.
         load_json(): Loads partition data from a JSON file.
+        load_json_into_process(returning_queue, file_path): Worker for loading partitions.
         compute_data(): Computes partition data from a PDF file.
         on_unstructured_result(results): Handles results from the compute process.
         invoke_unstructured_into_process(returning_queue, file_path): Worker for computing partitions.
         save_json(): Saves the current partition tree to a JSON file.
+        save_json_into_process(returning_queue, pdf_partition_tree, file_path): Worker for saving partitions.
         import_data(): Imports partitioned regions into the application.
         on_import_result(results): Handles results from the import process.
         import_from_unstructured(returning_queue, document_name, pdf_partition_tree, resolution_text): Worker for importing partitions.
         update_buttons(): Updates the enabled/disabled state of dialog buttons based on current mode.
     """
     
+    # The partitions loaded by `load_json` as `{(real path, modification time, size): partitions}`, which are shared among dialogs 
+    _loaded_partitions_cache = OrderedDict()
+    LOADED_PARTITIONS_CACHE_SIZE = 8 # Maximum number of files stored in `_loaded_partitions_cache`
+    
     
     def __init__(self, document: Optional[fitz.Document] = None) -> None:
         """
@@ -169,24 +234,71 @@ class UnstructuredDialog(QDialog):
     def load_json(self) -> None:
         """
         Opens a file dialog for the user to select a JSON file and loads its contents
-        into the application's PDF partition tree. Updates the application state and
-        UI accordingly. Displays a success message upon successful import, or an error
-        message if loading fails.
+        into the application's PDF partition tree in a background process (see `load_json_into_process`). 
+        Updates the application state and UI accordingly. Displays a success message upon successful import, 
+        or an error message if loading fails. The last loaded files are cached (until they are modified) in this 
+        process, so that reloading them does not parse them again.
 
         Returns:
             None
         """
         
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select JSON File", "", "JSON Files (*.json)") # TODO set default path from "" to working directory
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select JSON File", "", "JSON Files (*.json)") # TODO set default path from "" to working directory
         if file_path:
-            try:
-                self.pdf_partition_tree = UnstructuredImporter.load_unstructured_results(file_path)
+            def on_loaded(pdf_partition_tree: List['Element']) -> None:
+                self.pdf_partition_tree = list(pdf_partition_tree) # The elements are shared with the cache
                 self.loaded = True
                 self.computed = False
                 QMessageBox.information(self, "Success", f"Data imported from {file_path}")
                 self.update_buttons()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load JSON: {e}")
+            
+            cache = UnstructuredDialog._loaded_partitions_cache
+            try:
+                stat = os.stat(file_path)
+                key = (os.path.realpath(file_path), stat.st_mtime, stat.st_size)
+            except OSError:
+                key = None # The process reports the error
+            if key in cache:
+                cache.move_to_end(key)
+                on_loaded(cache[key])
+                return
+            
+            def on_result(results: Dict[str, Any]) -> None:
+                pdf_partition_tree = ProgressingRunner.get_outcome(results)
+                if key is not None:
+                    cache[key] = pdf_partition_tree
+                    if len(cache) > UnstructuredDialog.LOADED_PARTITIONS_CACHE_SIZE:
+                        cache.popitem(last=False)
+                on_loaded(pdf_partition_tree)
+            
+            def on_error(results: Dict[str, Any]) -> None:
+                QMessageBox.critical(self, "Error", f"Failed to load JSON: {ProgressingRunner.get_error(results)}")
+            
+            dialog = ProgressingRunner(UnstructuredDialog.load_json_into_process, self, cooperative=False)
+            dialog.start(on_result=on_result, on_error=on_error, show_alert_error=False, file_path=file_path)
+
+
+    @staticmethod
+    def load_json_into_process(returning_queue: Queue, file_path: str) -> None:
+        """
+        Loads the Unstructured partitions from a JSON file and communicates the result or error via a queue.
+
+        Args:
+            returning_queue (Queue): The queue to which the outcome or error will be added.
+            file_path (str): The path to the JSON file to be loaded.
+
+        Returns:
+            None
+        """
+        
+        try:
+            pdf_partition_tree = UnstructuredImporter.load_unstructured_results(file_path)
+            if pdf_partition_tree is None:
+                raise ValueError(f"Cannot load Unstructured partitions from {file_path}.")
+            ProgressingRunner.add_outcome(returning_queue, pdf_partition_tree)
+        except Exception as e:
+            # Return errors if necessary
+            ProgressingRunner.add_exception(returning_queue, e)
 
 
     def compute_data(self) -> None:
@@ -263,12 +375,12 @@ class UnstructuredDialog(QDialog):
         """
         
         try:
-            pdf_partition = UnstructuredImporter.invoke_unstructured(file_path)
+            on_progress = lambda done, total: ProgressingRunner.add_progress(returning_queue, f"Partitioned {done} of {total} page batches...")
+            pdf_partition = UnstructuredImporter.invoke_unstructured(file_path, on_progress)
             ProgressingRunner.add_outcome(returning_queue, pdf_partition)
         except Exception as e:
             # Return errors if necessary
-            ProgressingRunner.add_error(returning_queue, e)
-            traceback.print_exc()
+            ProgressingRunner.add_exception(returning_queue, e)
       
             
     def save_json(self) -> None:
@@ -277,11 +389,8 @@ class UnstructuredDialog(QDialog):
 
         This method checks if there is data available in `self.pdf_partition_tree`. If not, it displays a warning message.
         If data is available, it opens a file dialog for the user to select a location to save the JSON file.
-        The data is then saved using `UnstructuredImporter.save_unstructured_partitions`.
-        Success and error messages are displayed to the user accordingly.
-
-        Raises:
-            Exception: If saving the JSON file fails.
+        The data is then saved in a background process using `UnstructuredImporter.save_unstructured_partitions` 
+        (see `save_json_into_process`). Success and error messages are displayed to the user accordingly.
         """
         
         if not self.pdf_partition_tree:
@@ -290,11 +399,37 @@ class UnstructuredDialog(QDialog):
 
         file_path, _ = QFileDialog.getSaveFileName(self, "Save JSON File", "", "JSON Files (*.json)")
         if file_path:
-            try:
-                UnstructuredImporter.save_unstructured_partitions(self.pdf_partition_tree, file_path)
+            def on_result(results: Dict[str, Any]) -> None:
                 QMessageBox.information(self, "Success", f"Data saved to {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save JSON: {e}")
+            
+            def on_error(results: Dict[str, Any]) -> None:
+                QMessageBox.critical(self, "Error", f"Failed to save JSON: {ProgressingRunner.get_error(results)}")
+            
+            dialog = ProgressingRunner(UnstructuredDialog.save_json_into_process, self, cooperative=False)
+            dialog.start(on_result=on_result, on_error=on_error, show_alert_error=False, 
+                         pdf_partition_tree=self.pdf_partition_tree, file_path=file_path)
+
+
+    @staticmethod
+    def save_json_into_process(returning_queue: Queue, pdf_partition_tree: List['Element'], file_path: str) -> None:
+        """
+        Saves the Unstructured partitions to a JSON file and communicates the outcome (i.e., `file_path`) or error via a queue.
+
+        Args:
+            returning_queue (Queue): The queue to which the outcome or error will be added.
+            pdf_partition_tree (List[Element]): The partitions to be saved.
+            file_path (str): The path to the JSON file to be written.
+
+        Returns:
+            None
+        """
+        
+        try:
+            UnstructuredImporter.save_unstructured_partitions(pdf_partition_tree, file_path)
+            ProgressingRunner.add_outcome(returning_queue, file_path)
+        except Exception as e:
+            # Return errors if necessary
+            ProgressingRunner.add_exception(returning_queue, e)
 
 
     def import_data(self) -> None:
@@ -351,13 +486,14 @@ class UnstructuredDialog(QDialog):
 
 
     @staticmethod
-    def import_from_unstructured(returning_queue: Queue, document_name: str, pdf_partition_tree: List[Element], resolution_text: str) -> None:
+    def import_from_unstructured(returning_queue: Queue, document_name: str, pdf_partition_tree: List['Element'], resolution_text: str) -> None:
         """
         Imports and partitions a PDF document using unstructured data.
 
         Args:
             returning_queue (Queue): Queue to return results or errors.
-            document_name (str): Path to the PDF document to import.
+            document_name (str): Path to the PDF document to import, which is opened again in this process (i.e., without
+                sharing the file offset of the document opened by the GUI).
             pdf_partition_tree (List[Element]): List representing the partition tree of PDF elements.
             resolution_text (str): Text specifying the desired image resolution.
 
@@ -371,6 +507,7 @@ class UnstructuredDialog(QDialog):
             - Adds partitioned regions or errors to the returning_queue.
             - Closes the PDF document after processing.
         """
+        document = None
         try: 
             document = fitz.Document(document_name)
             max_resolution = SelectionDialog.parse_image_resolution(resolution_text)
@@ -379,10 +516,10 @@ class UnstructuredDialog(QDialog):
             ProgressingRunner.add_outcome(returning_queue, partitions)
         except Exception as e:
             # Return errors if necessary
-            ProgressingRunner.add_error(returning_queue, e)
-            traceback.print_exc()
+            ProgressingRunner.add_exception(returning_queue, e)
         finally:
-            document.close()
+            if document is not None:
+                document.close()
 
 
     def update_buttons(self) -> None:
@@ -447,11 +584,12 @@ class UnstructuredImporter:
         KEY_ORIENTATION (str): Key for system orientation.
         KEY_VALUE (str): Key for orientation value.
         MAX_IMAGE_RESOLUTION_DEFAULT (tuple): Default max image resolution for resizing.
+        SIMPLIFY_TOLERANCE_DEFAULT (float): Default tolerance for simplifying the polygons inferred from children.
     Methods:
-        __init__(document, partitions_tree, max_image_resolution):
+        __init__(document, partitions_tree, max_image_resolution, simplify_tolerance):
             Initializes the importer with a PDF document and partition tree.
         to_pages_sizes(document):
-            Returns a mapping of page numbers to their sizes (width, height).
+            Returns an array of the pages sizes (width, height).
         invoke_unstructured(pdf_path):
             Runs Unstructured's partition_pdf on the given PDF and returns elements.
         save_unstructured_partitions(partition_tree, filepath):
@@ -466,10 +604,8 @@ class UnstructuredImporter:
             Extracts and parses coordinate metadata from an element.
         _coords_to_pdf(elem, page_size):
             Converts Unstructured coordinates to PDF reference frame.
-        enclosing_polygon(bboxes):
+        enclosing_polygon(bboxes, tolerance):
             Computes the tightest polygon enclosing a list of bounding boxes.
-        resize_base64_image_if_needed(b64_str, max_size):
-            Resizes a base64-encoded image if it exceeds max_size.
         _visit_partition_tree(elem, parent_id):
             Recursively traverses and processes the partition tree.
         get_partitioned_regions():
@@ -511,19 +647,38 @@ class UnstructuredImporter:
     # CATEGORY_UNCATEGORIZED_TEXT = "UncategorizedText"
 
     MAX_IMAGE_RESOLUTION_DEFAULT = (512, 512)
+    SIMPLIFY_TOLERANCE_DEFAULT = 0.5 # In PDF points (i.e., 1/72 inch)
+    POLYGON_FILL_MIN_POINTS = 8 # The minimum number of vertices to fill a polygon from an array in `_to_polygon`
+    
+    # The Unstructured strategies used by `invoke_unstructured`
+    STRATEGY_FAST = "fast"       # It only uses the PDF text layer
+    STRATEGY_HI_RES = "hi_res"   # It uses a layout detection model (and OCR), and it infers tables structure
+    
+    TEXT_LAYER_SAMPLED_PAGES = 16      # The maximum number of pages checked to detect if a PDF has a text layer
+    TEXT_LAYER_MIN_COVERAGE = 0.9      # The minimum ratio of sampled pages with text to consider that a PDF has a text layer
+    PARTITION_BATCH_PAGES = 10         # The number of pages of each PDF batch partitioned in parallel with the `hi_res` strategy
+    PARTITION_MAX_WORKERS = 4          # The maximum number of processes partitioning the batches (each of them loads its own models)
 
-    def __init__(self, document: fitz.Document, partitions_tree: List[Element], max_image_resolution: Tuple[int, int] = MAX_IMAGE_RESOLUTION_DEFAULT):
+    def __init__(self, document: fitz.Document, partitions_tree: List['Element'], max_image_resolution: Tuple[int, int] = MAX_IMAGE_RESOLUTION_DEFAULT,
+                 simplify_tolerance: float = SIMPLIFY_TOLERANCE_DEFAULT):
         """
         Initializes the UnstructuredImporter instance with a PDF document, its partition tree, and optional maximum image resolution.
         Args:
             document (fitz.Document): The PDF document to be imported.
             partitions_tree (List[Element]): A list representing the partition tree structure of the document.
             max_image_resolution (Tuple[int, int], optional): The maximum allowed image resolution. Defaults to MAX_IMAGE_RESOLUTION_DEFAULT.
+            simplify_tolerance (float, optional): The minimum tolerance (in PDF points) used to simplify the polygons inferred from children 
+                (see `enclosing_polygon`). It is increased to the 0.1% of the smaller page side on big pages. Defaults to SIMPLIFY_TOLERANCE_DEFAULT.
         Attributes:
             pdf_partitions (Dict[int, List[Dict[str, Any]]]): Stores partitioned PDF data by page number.
             _pdf_path (str): Path to the PDF file.
-            _pages_sizes (List[Tuple[float, float]]): List of page sizes for the document.
+            _pages_sizes (np.ndarray): The `(pages, 2)` array of page sizes for the document (see `to_pages_sizes`).
             _max_image_resolution (Tuple[int, int]): Maximum allowed image resolution.
+            _simplify_tolerance (float): Minimum tolerance to simplify inferred polygons.
+            _image_executor (ThreadPoolExecutor): The threads encoding the screenshots while the tree is visited.
+            _pending_images (List[Tuple[SelectionData, Future]]): The nodes whose screenshot is being encoded.
+            _display_list_page (Optional[int]): The page number of `_display_list`.
+            _display_list (Optional[Tuple[fitz.Page, fitz.DisplayList]]): The last page used to take screenshots and its display list.
             _document (fitz.Document): The PDF document object.
             partitions_tree (List[Element]): The partition tree structure.
         Raises:
@@ -534,42 +689,53 @@ class UnstructuredImporter:
         self._pdf_path = document.name
         self._pages_sizes = UnstructuredImporter.to_pages_sizes(document)
         self._max_image_resolution = max_image_resolution
+        self._simplify_tolerance = simplify_tolerance
         self._document = document
+        self._pending_images: List[Tuple[SelectionData, Future]] = []
+        self._display_list_page: Optional[int] = None
+        self._display_list: Optional[Tuple[fitz.Page, fitz.DisplayList]] = None
         
         try:
             self.partitions_tree = partitions_tree
             if partitions_tree:    
-                for e in partitions_tree: # `visit` the list
-                    self._visit_partition_tree(e, parent_id=None)#, inherited_page=None)
+                # Screenshots are rendered by this thread (PyMuPDF is not thread safe), but they are resized and encoded 
+                # in parallel (PIL releases the GIL), while the rest of the tree is visited
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as self._image_executor:
+                    for e in partitions_tree: # `visit` the list
+                        self._visit_partition_tree(e, parent_id=None)#, inherited_page=None)
+                    for node, image in self._pending_images:
+                        node.image = image.result()
+                self._pending_images.clear()
+                self._display_list_page = self._display_list = None # Release the page contents
         except Exception as e:
             traceback.print_exc()
             QMessageBox.warning(self, "Error", f"Error while importing `Unstructured` partitions: {e}")
            
                     
     @staticmethod
-    def to_pages_sizes(document: fitz.Document) -> Dict[int, Tuple[float, float]]:
+    def to_pages_sizes(document: fitz.Document) -> np.ndarray:
         """
         Extracts the width and height of each page in a PDF document.
         Args:
             document (fitz.Document): The PDF document to extract page sizes from.
         Returns:
-            Dict[int, Tuple[float, float]]: A dictionary mapping page numbers (starting from 1)
-                to a tuple containing the width and height of each page in PDF points.
+            np.ndarray: A read-only `(pages, 2)` array where the row `i` contains the width and height (in PDF points) 
+                of the page with number `i + 1`.
         """
         
-        page_sizes: Dict[int, Tuple[float, float]] = {}
-        for i in range(len(document)):
-            r = document[i].rect
-            page_sizes[i + 1] = (float(r.width), float(r.height)) # store width,height in PDF points
+        page_sizes = np.array([(page.rect.width, page.rect.height) for page in document], dtype=np.float64).reshape(-1, 2)
+        page_sizes.setflags(write=False)
         return page_sizes
 
 
     @staticmethod
-    def invoke_unstructured(pdf_path: str) -> List[Element]: 
+    def invoke_unstructured(pdf_path: str, on_progress: Optional[Callable[[int, int], None]] = None) -> List['Element']: 
         """
         Invokes the Unstructured library's `partition_pdf` function to extract structured elements from a PDF file.
         Args:
             pdf_path (str): The path to the PDF file to be processed.
+            on_progress (Optional[Callable[[int, int], None]]): If given, it is called with the number of partitioned 
+                and total batches each time a batch of pages is partitioned (see below). Defaults to None.
         Returns:
             List[Element]: A list of elements extracted from the PDF, where each element may represent text, titles, tables, images, or composite elements.
                 Each element contains metadata such as page number, coordinates, and may include nested child elements.
@@ -577,8 +743,10 @@ class UnstructuredImporter:
             The returned elements may include metadata fields like `page_number`, `coordinates`, and `orig_element` for nested structures.
             Coordinates are provided as a list of points and may include system information about pixel space and orientation.
         Note:
-            The function uses high-resolution strategy and infers table structure. It also extracts image and table blocks, chunking text by title,
-            and combines or splits text blocks based on character limits.
+            If the PDF has a text layer (see `has_text_layer`), the function uses the fast strategy. Otherwise, it uses the high-resolution 
+            strategy, which infers table structure; in this case, large PDFs are split in batches of 
+            `PARTITION_BATCH_PAGES` pages that are partitioned in parallel. In both cases, text is chunked by title, and text blocks are 
+            combined or split based on character limits. 
         """
         
         # Example data structure returned from Unstructured with `partition_pdf`
@@ -621,22 +789,157 @@ class UnstructuredImporter:
         #     ]
         #  
         
-        partitions = partition_pdf(
-            filename=pdf_path,
-            strategy="hi_res",
-            infer_table_structure=True,
-            extract_image_block_types=["Image", "Table"],
-            extract_image_block_to_payload=True,
+        with fitz.Document(pdf_path) as document:
+            if UnstructuredImporter.has_text_layer(document):
+                # Avoid running the layout detection model since the text can be directly extracted
+                return UnstructuredImporter._partition_pages(pdf_path, strategy=UnstructuredImporter.STRATEGY_FAST)
+            pages_count = len(document)
+        
+        batch = UnstructuredImporter.PARTITION_BATCH_PAGES
+        if pages_count <= batch:
+            return UnstructuredImporter._partition_pages(pdf_path, strategy=UnstructuredImporter.STRATEGY_HI_RES)
+        
+        # Partition batches of pages in parallel, and merge them in the order of pages
+        first_pages = range(0, pages_count, batch)
+        max_workers = min(UnstructuredImporter.PARTITION_MAX_WORKERS, os.cpu_count() or 1, len(first_pages))
+        batches = [(i, pdf_path, first_page, min(first_page + batch, pages_count)) for i, first_page in enumerate(first_pages)]
+        batches_partitions = [None] * len(batches)
+        with Pool(processes=max_workers) as pool:
+            previous_handler = UnstructuredImporter._terminate_pool_on_sigterm(pool)
+            try:
+                # Notify each batch as soon as it is done, whatever its order (errors are raised as soon as possible)
+                for done, (i, batch_partitions) in enumerate(pool.imap_unordered(UnstructuredImporter._partition_batch, batches), start=1):
+                    batches_partitions[i] = batch_partitions
+                    if on_progress is not None:
+                        on_progress(done, len(batches))
+            finally:
+                if previous_handler is not None:
+                    signal.signal(signal.SIGTERM, previous_handler)
+        partitions = []
+        for batch_partitions in batches_partitions:
+            partitions.extend(batch_partitions)
+        return partitions
+    
+    
+    @staticmethod
+    def _partition_batch(batch: Tuple[int, str, int, int]) -> Tuple[int, List['Element']]:
+        """
+        Partitions a batch of pages with the `hi_res` strategy (see `_partition_pages`) in the pool of `invoke_unstructured`.
+        Args:
+            batch (Tuple[int, str, int, int]): The index of the batch, the path to the PDF file, and its first (included) 
+                and last (excluded) pages.
+        Returns:
+            Tuple[int, List[Element]]: The index of the batch, and the elements extracted from its pages.
+        """
+        
+        i, pdf_path, first_page, last_page = batch
+        return i, UnstructuredImporter._partition_pages(pdf_path, UnstructuredImporter.STRATEGY_HI_RES, first_page, last_page)
+    
+    
+    @staticmethod
+    def _terminate_pool_on_sigterm(pool: 'Pool') -> Optional[Any]:
+        """
+        Installs a SIGTERM handler that terminates the processes of `pool` before terminating this process. Otherwise, cancelling
+        the `ProgressingRunner` that runs `invoke_unstructured` (i.e., terminating its process) would leave the pool processes 
+        partitioning their batches until they are done.
+        Args:
+            pool (Pool): The pool partitioning the batches of pages, whose processes have already been started.
+        Returns:
+            Optional[Any]: The previous SIGTERM handler, which should be restored when `pool` is no longer used, or None if 
+                the handler cannot be installed since this is not the main thread.
+        """
+        
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        
+        def on_terminate(signum, frame):
+            pool.terminate()
+            signal.signal(signal.SIGTERM, previous_handler)
+            signal.raise_signal(signal.SIGTERM)
+        
+        previous_handler = signal.signal(signal.SIGTERM, on_terminate)
+        if previous_handler is None: # It was not installed from Python
+            previous_handler = signal.SIG_DFL
+        return previous_handler
+    
+    
+    @staticmethod
+    def has_text_layer(document: fitz.Document) -> bool:
+        """
+        Checks whether a PDF document has an extractable text layer (i.e., it is not a scanned document).
+        Args:
+            document (fitz.Document): The PDF document to check.
+        Returns:
+            bool: True if at least `TEXT_LAYER_MIN_COVERAGE` of the sampled pages (at most `TEXT_LAYER_SAMPLED_PAGES` evenly 
+                spaced pages) contain some text.
+        """
+        
+        pages_count = len(document)
+        if pages_count == 0:
+            return False
+        step = max(1, pages_count // UnstructuredImporter.TEXT_LAYER_SAMPLED_PAGES)
+        sampled = range(0, pages_count, step)
+        with_text = sum(1 for i in sampled if document[i].get_text("text").strip())
+        return with_text / len(sampled) >= UnstructuredImporter.TEXT_LAYER_MIN_COVERAGE
+    
+    
+    @staticmethod
+    def _partition_pages(pdf_path: str, strategy: str, first_page: Optional[int] = None, last_page: Optional[int] = None) -> List['Element']:
+        """
+        Runs Unstructured's `partition_pdf` on the given PDF with a given `strategy`.
+        Args:
+            pdf_path (str): The path to the PDF file to be processed.
+            strategy (str): Either `STRATEGY_FAST` or `STRATEGY_HI_RES`.
+            first_page (Optional[int]): If given, only the pages from `first_page` (included, starting from 0) to `last_page` 
+                (excluded) are partitioned. Defaults to None.
+            last_page (Optional[int]): See `first_page`. Defaults to None.
+        Returns:
+            List[Element]: The elements extracted from the PDF, where the page numbers refer to the whole PDF.
+        """
+        
+        from unstructured.partition.pdf import partition_pdf # Imported here since it is slow to load and only needed on computation
+        kwargs = dict(
+            strategy=strategy,
             chunking_strategy="by_title",
             max_characters=10000,
             combine_text_under_n_chars=2000,
             new_after_n_chars=6000,
         )
+        if strategy == UnstructuredImporter.STRATEGY_HI_RES:
+            # Images are not extracted since they are rendered from the PDF page when partitions are imported
+            kwargs.update(infer_table_structure=True)
+        
+        if first_page is None:
+            return partition_pdf(filename=pdf_path, **kwargs)
+        
+        # Partition an in-memory PDF with the selected pages only
+        with fitz.Document(pdf_path) as document:
+            document.select(range(first_page, last_page))
+            pdf_bytes = document.tobytes()
+        partitions = partition_pdf(
+            file=BytesIO(pdf_bytes),
+            metadata_filename=pdf_path,
+            unique_element_ids=True, # Ids are based on the page number, which is relative to the batch
+            **kwargs
+        )
+        UnstructuredImporter._offset_page_numbers(partitions, first_page)
         return partitions
+    
+    
+    @staticmethod
+    def _offset_page_numbers(elements: List['Element'], offset: int) -> None:
+        """Add `offset` to the page number of each element and its children (i.e., `metadata.orig_elements`), recursively."""
+        
+        for elem in elements:
+            metadata = elem.metadata
+            if metadata.page_number is not None:
+                metadata.page_number += offset
+            if metadata.orig_elements:
+                UnstructuredImporter._offset_page_numbers(metadata.orig_elements, offset)
 
 
     @staticmethod
-    def save_unstructured_partitions(partition_tree: List[Element], filepath: str) -> None:
+    def save_unstructured_partitions(partition_tree: List['Element'], filepath: str) -> None:
         """
         Serializes a list of Unstructured Elements to JSON and saves it to the specified file.
         Args:
@@ -648,7 +951,7 @@ class UnstructuredImporter:
             ValueError: If no elements are serialized to JSON.
             Exception: For any other errors encountered during saving.
         Side Effects:
-            Writes serialized JSON to the specified file.
+            Writes serialized JSON to the specified file, which is left unchanged if an error occurs.
             Prints status and error messages to the console.
         """
     
@@ -656,11 +959,17 @@ class UnstructuredImporter:
             return None
         try:
             print(f"saving Unstructured elements to {filepath}") # TODO make alert
-            json_str = elements_to_json(partition_tree)
-            if not json_str or json_str == "[]":
+            if len(partition_tree) == 0: # Checked before opening the file to not overwrite it
                 raise ValueError("No elements serialized to JSON. Check your partitioned PDF.") # TODO make alert
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(json_str)
+            # Write next to the file, and replace it only when done, so that a failure does not leave it half written
+            temp_filepath = filepath + ".tmp"
+            try:
+                with open(temp_filepath, "wb") as f:
+                    _write_elements_json(partition_tree, f)
+                os.replace(temp_filepath, filepath)
+            finally:
+                if os.path.exists(temp_filepath):
+                    os.remove(temp_filepath)
         except Exception as e:
             print(f"Error saving Unstructured PDF partitions in {filepath}.") # TODO make alert
             traceback.print_exc()
@@ -679,7 +988,7 @@ class UnstructuredImporter:
 
 
     @staticmethod
-    def load_unstructured_results(filepath: str) -> Optional[List[Element]]:
+    def load_unstructured_results(filepath: str) -> Optional[List['Element']]:
         """
         Loads and returns a list of Element objects from a JSON file containing unstructured PDF partition results.
         Args:
@@ -693,7 +1002,7 @@ class UnstructuredImporter:
         if filepath is None: 
             return None
         try:
-            return elements_from_json(filepath)
+            return _load_elements(filepath)
         except Exception as e:
             print(f"Error loading Unstructured PDF partitions from {filepath}.") # TODO make alert
             traceback.print_exc()
@@ -701,7 +1010,7 @@ class UnstructuredImporter:
 
 
     @staticmethod
-    def _parse_unstructured_item(elem: Element, attribute: str, should_log: bool = True, datapath: str = "") -> Any:
+    def _parse_unstructured_item(elem: 'Element', attribute: str, should_log: bool = True, datapath: str = "") -> Any:
         """
         Extracts the value of a specified attribute from an Element object, with optional logging if the attribute is missing.
 
@@ -725,7 +1034,7 @@ class UnstructuredImporter:
 
 
     @staticmethod
-    def _parse_unstructured_coordinates(elem: Element) -> Optional[Tuple[List[Tuple[float, float]], List[float], float, float]]:
+    def _parse_unstructured_coordinates(elem: 'Element') -> Optional[Tuple[np.ndarray, float, float, float]]:
         """
         Parses unstructured coordinate data from an XML/Element object.
         Traverses the element's metadata to extract coordinate points, orientation, width, and height.
@@ -733,56 +1042,37 @@ class UnstructuredImporter:
         Args:
             elem (Element): The XML/Element object containing unstructured coordinate data.
         Returns:
-            Optional[Tuple[List[Tuple[float, float]], List[float], float, float]]:
+            Optional[Tuple[np.ndarray, float, float, float]]:
                 A tuple containing:
-                    - pts (List[Tuple[float, float]]): List of (x, y) coordinate points.
-                    - orientation (List[float]): Orientation values.
+                    - pts (np.ndarray): The `(N, 2)` array of (x, y) coordinate points.
+                    - orientation_y (float): The orientation of the y axis (i.e., the second orientation value).
                     - sys_w (float): System width.
                     - sys_h (float): System height.
                 Returns None if any required field is missing.
         """
 
-        # element -> `metadata`
-        metadata = UnstructuredImporter._parse_unstructured_item(elem, UnstructuredImporter.KEY_METADATA)
-        if metadata is None: return None
-        
-        # element -> `metadata.coordinates` (It might not exists, e.g., for meta chunks)
-        coords = UnstructuredImporter._parse_unstructured_item(metadata, UnstructuredImporter.KEY_COORDINATES, should_log=False)
+        # element -> `metadata.coordinates` (It might not exists, e.g., for meta chunks, and it is not logged)
+        # Since `getattr(None, key, None)` is `None`, each field is retrieved without checking its parent
+        metadata = getattr(elem, UnstructuredImporter.KEY_METADATA, None)
+        coords = getattr(metadata, UnstructuredImporter.KEY_COORDINATES, None)
         if coords is None: return None
         
-        # element -> `metadata.coordinates.points`
-        pts = UnstructuredImporter._parse_unstructured_item(coords, UnstructuredImporter.KEY_POINTS)
-        if pts is None: return None
-        pts = [(float(x), float(y)) for (x, y) in pts]
-        
-        # element -> `metadata.coordinates.points.system`
-        system = UnstructuredImporter._parse_unstructured_item(coords, UnstructuredImporter.KEY_SYSTEM)
-        if system is None: return None
-        
-        # element -> `metadata.coordinates.points.system.width`
-        sys_w = UnstructuredImporter._parse_unstructured_item(system, UnstructuredImporter.KEY_WIDTH)
-        if sys_w is None: return None
-        sys_w = float(sys_w)
-        
-        # element -> `metadata.coordinates.points.system.height`
-        sys_h = UnstructuredImporter._parse_unstructured_item(system, UnstructuredImporter.KEY_HEIGHT)
-        if sys_h is None: return None
-        sys_h = float(sys_h)
-        
-        # element -> `metadata.coordinates.points.system.orientation`
-        orientation = UnstructuredImporter._parse_unstructured_item(system, UnstructuredImporter.KEY_ORIENTATION)
-        if orientation is None: return None
-        
-        # element -> `metadata.coordinates.points.system.orientation.value`
-        orientation = UnstructuredImporter._parse_unstructured_item(orientation, UnstructuredImporter.KEY_VALUE)
-        if orientation is None: return None
-        orientation = list(orientation)
+        # element -> `metadata.coordinates.points` and `metadata.coordinates.points.system.{width, height, orientation.value}`
+        pts = getattr(coords, UnstructuredImporter.KEY_POINTS, None)
+        system = getattr(coords, UnstructuredImporter.KEY_SYSTEM, None)
+        sys_w = getattr(system, UnstructuredImporter.KEY_WIDTH, None)
+        sys_h = getattr(system, UnstructuredImporter.KEY_HEIGHT, None)
+        orientation = getattr(getattr(system, UnstructuredImporter.KEY_ORIENTATION, None), UnstructuredImporter.KEY_VALUE, None)
+        if pts is None or sys_w is None or sys_h is None or orientation is None:
+            print(f"Incomplete `{UnstructuredImporter.KEY_METADATA}.{UnstructuredImporter.KEY_COORDINATES}` found in Unstructured item.")
+            return None
         
-        return pts, orientation, sys_w, sys_h
+        pts = np.asarray(pts, dtype=np.float64).reshape(-1, 2)
+        return pts, float(orientation[1]), float(sys_w), float(sys_h)
 
 
     @staticmethod
-    def _coords_to_pdf(elem: Element, page_size: Tuple[float, float]) -> Optional[List[Tuple[float,float]]]:
+    def _coords_to_pdf(elem: 'Element', page_size: Tuple[float, float]) -> Optional[List[Tuple[float,float]]]:
         """
         Converts element coordinates from a custom system to PDF coordinates based on the page size.
         Returns a list of points `[[x1,y1],[x2,y2],...[...]].
@@ -802,29 +1092,31 @@ class UnstructuredImporter:
         parsed = UnstructuredImporter._parse_unstructured_coordinates(elem)
         if parsed is None:
             return
-        pts, orientation, sys_w, sys_h = parsed
+        pts, orientation_y, sys_w, sys_h = parsed
         
         # If we have sys_w/sys_h, perform proportional mapping to page_width/page_height
         page_width, page_height = page_size
-        mapped = []
-        invert_y = False
-        if float(orientation[1]) < 0:
-            invert_y = True
+        invert_y = orientation_y < 0
 
-        for (x, y) in pts:
-            x_pdf = (x / sys_w) * page_width 
-            y_pdf = (y / sys_h) * page_height
-            if not invert_y: # TODO why it works on the opposite way round? It should be `invert_y` instead of `not invert_y`.
-                # orientation had negative y: flip
-                y_pdf = page_height - y_pdf
-            # At this point (x_pdf, y_pdf) are in PDF units but with origin at bottom-left if we didn't invert
-            mapped.append([float(x_pdf), float(y_pdf)])
-
-        return mapped     
+        # TODO why it works on the opposite way round? It should flip on `invert_y` instead of `not invert_y`.
+        # At this point points are in PDF units but with origin at bottom-left if we didn't invert
+        flip_y = not invert_y
+        scale_x = float(page_width) / sys_w
+        scale_y = float(page_height) / sys_h
+        
+        # Use the compiled mapping, if available
+        if njit is not None:
+            return _points_to_pdf(pts, scale_x, scale_y, float(page_height), flip_y).tolist()
+        
+        # Otherwise, map all points with broadcasting
+        mapped = pts * (scale_x, scale_y)
+        if flip_y:
+            mapped[:, 1] = page_height - mapped[:, 1]
+        return mapped.tolist()
 
 
     @staticmethod
-    def enclosing_polygon(bboxes: List[List[Tuple[float, float]]]) -> List[Tuple[float, float]]:
+    def enclosing_polygon(bboxes: List[List[Tuple[float, float]]], tolerance: float = 0.0) -> List[Tuple[float, float]]:
         """
         Given a list of bounding boxes (each defined by 4 (x,y) points),
         return the vertices of the tightest polygon (possibly concave)
@@ -833,82 +1125,129 @@ class UnstructuredImporter:
         Parameters:
             bboxes (list): List of bounding boxes,
                         where each box = [(x1,y1), (x2,y2), (x3,y3), (x4,y4)]
+            tolerance (float): If positive, the polygon is simplified by removing the vertices 
+                        that are closer than `tolerance` to the simplified boundary (e.g., collinear points).
         
         Returns:
             list: Vertices of the enclosing polygon in counterclockwise order
         """
         
-        # Convert each box into a Polygon
-        polys = [Polygon(box) for box in bboxes]
+        # Discard the boxes within a rectangular box since they do not change the union (without using Shapely)
+        bboxes = UnstructuredImporter._drop_contained_boxes(bboxes)
+        if len(bboxes) == 1 and len(bboxes[0]) == 4:
+            box = [tuple(p) for p in bboxes[0]]
+            return box + box[:1] # The remaining rectangle is the union, closed as Shapely rings
+        
+        # Convert each box into a Polygon (with a single vectorized call if all boxes have the same number of vertices)
+        if len({len(box) for box in bboxes}) == 1:
+            polys = polygons(np.asarray(bboxes, dtype=np.float64))
+        else:
+            polys = [Polygon(box) for box in bboxes]
         # Merge them into one shape
-        merged = unary_union(polys)
+        merged = union_all(polys)
         # If result is a MultiPolygon, take the outer boundary of the union
         if merged.geom_type == "MultiPolygon":
             merged = merged.convex_hull  # or cascaded_union for all
+        # Reduce the vertices to render and process
+        if tolerance > 0:
+            simplified = merged.simplify(tolerance, preserve_topology=False)
+            if simplified.geom_type == "Polygon" and not simplified.is_empty:
+                merged = simplified
         # Get the exterior boundary (outer polygon)
         exterior_coords = list(merged.exterior.coords)
         return exterior_coords
        
        
-    @staticmethod 
-    def resize_base64_image_if_needed(b64_str: str, max_size: Tuple[int, int] = MAX_IMAGE_RESOLUTION_DEFAULT) -> str:
+    @staticmethod
+    def _drop_contained_boxes(bboxes: List[List[Tuple[float, float]]]) -> List[List[Tuple[float, float]]]:
+        """Return the `bboxes` that are not within the axis-aligned bounding box of another box in `bboxes` which is an 
+        axis-aligned rectangle itself (i.e., 4 vertices on its bounding box corners). Only the first of identical boxes is kept."""
+        
+        bounds = [(min(x for x, _ in box), min(y for _, y in box), max(x for x, _ in box), max(y for _, y in box)) for box in bboxes]
+        is_rect = [
+            len(box) == 4 and all(x in (b[0], b[2]) and y in (b[1], b[3]) for x, y in box)
+            for box, b in zip(bboxes, bounds)
+        ]
+        kept = []
+        for j, (box, bj) in enumerate(zip(bboxes, bounds)):
+            contained = any(
+                is_rect[i] and i != j and bi[0] <= bj[0] and bi[1] <= bj[1] and bj[2] <= bi[2] and bj[3] <= bi[3] 
+                and (bi != bj or i < j)
+                for i, bi in enumerate(bounds)
+            )
+            if not contained:
+                kept.append(box)
+        return kept
+
+
+    def _visit_partition_tree(self, root: 'Element', parent_id: Optional[str]) -> SelectionData:
         """
-        Decodes a base64-encoded image, resizes it if its dimensions exceed the specified maximum size 
-        (while preserving aspect ratio), and returns the resized image as a base64-encoded string.
+        Traverses a partition tree structure, extracting relevant data from each element and its metadata,
+        and populates the `pdf_partitions` dictionary with `SelectionData` nodes for each partition.
+        The tree is traversed with an explicit stack (deep trees do not hit the recursion limit) to collect its elements
+        in post-order (i.e., children before their parent), which are then processed linearly.
         Args:
-            b64_str (str): The base64-encoded string representing the image.
-            max_size (Tuple[int, int], optional): The maximum allowed (width, height) for the image. 
-                Defaults to MAX_IMAGE_RESOLUTION_DEFAULT.
+            root (Element): The root element of the partition tree to process.
+            parent_id (Optional[str]): The ID of the parent partition of `root`, or None if it is a root of the document.
+        Behavior:
+            - Extracts metadata, ID, category, text, page number, children, coordinates, and image for each partition.
+            - Handles special cases for tables, and infers missing coordinates from children.
+            - Takes a screenshot of the partition from the PDF page.
+            - Populates a `SelectionData` node with the extracted information and appends it to the `pdf_partitions` dictionary,
+              grouped by page number (children are appended before their parent).
         Returns:
-            str: The base64-encoded string of the resized image. If the image is already within the 
-                maximum size, the original image is returned (re-encoded).
-        """
-
-        # Decode base64 string to bytes
-        img_data = base64.b64decode(b64_str)
-        # Open the image
-        img = Image.open(BytesIO(img_data))
-        # Resize only if larger than max_size (preserve aspect ratio)
-        img_copy = img.copy()  # avoid modifying the original
-        img_copy.thumbnail(max_size, Image.LANCZOS)
-        # Save resized (or original if no resize) to bytes
-        buffer = BytesIO()
-        img_copy.save(buffer, format=img.format)
-        resized_bytes = buffer.getvalue()
-        # Encode back to base64
-        b64_resized = base64.b64encode(resized_bytes).decode("utf-8")
-        
-        # Print comparison
-        #print(f"Original size        : {img.size}")
-        #print(f"Resized size         : {img_copy.size}")
-        #print(f"Original base64 chars: {len(b64_str)}")
-        #print(f"New base64 chars     : {len(b64_resized)}")
+            SelectionData: The node of `root`.
+        """
+        
+        # Collect the elements in post-order, as `(element, parent ID, metadata, ID, children)`
+        parse_item = UnstructuredImporter._parse_unstructured_item # Looked up once for all the elements
+        key_metadata, key_id, key_orig_elements = UnstructuredImporter.KEY_METADATA, UnstructuredImporter.KEY_ID, UnstructuredImporter.KEY_ORIG_ELEMENTS
+        order = []
+        stack = [(root, parent_id, None)]
+        while stack:
+            elem, elem_parent_id, visit = stack.pop()
+            # All the children of `elem` have been collected
+            if visit is not None:
+                order.append(visit)
+                continue
             
-        return b64_resized
+            # Get data ref
+            metadata = parse_item(elem, key_metadata)
+            if metadata is None:
+                print("Cannot extrapolate metadata from selection")
+
+            # Get the partition's ID
+            elem_id = parse_item(elem, key_id)
+            
+            # Get the partition's children
+            # element -> `metadata.orig_elements` (it might not exists, e.g., for leafs, and it is not logged)
+            children = getattr(metadata, key_orig_elements, None) or [] # `getattr(None, key, None)` is `None` if metadata is missing
+            
+            # Collect `elem` after its children, which are pushed in reverse order to be collected in their order
+            stack.append((elem, elem_parent_id, (elem, elem_parent_id, metadata, elem_id, children)))
+            stack.extend((child, elem_id, None) for child in reversed(children))
+        
+        # Visit the elements (children are visited before their parent)
+        nodes = {} # The visited nodes indexed by the `id()` of their element
+        for elem, elem_parent_id, metadata, elem_id, children in order:
+            nodes[id(elem)] = self._visit_partition(elem, elem_parent_id, metadata, elem_id, [nodes[id(c)] for c in children])
+        return nodes[id(root)]
     
     
-    def _visit_partition_tree(self, elem: Element, parent_id: Optional[str]) -> None:
+    def _visit_partition(self, elem: 'Element', parent_id: Optional[str], metadata: Any, elem_id: Optional[str], 
+                         child_nodes: List[SelectionData]) -> SelectionData:
         """
-        Recursively traverses a partition tree structure, extracting relevant data from each element and its metadata,
-        and populates the `pdf_partitions` dictionary with `SelectionData` nodes for each partition.
+        Creates the `SelectionData` node of a partition whose children have already been visited, and appends it to the 
+        `pdf_partitions` dictionary (see `_visit_partition_tree`).
         Args:
-            elem (Element): The current element in the partition tree to process.
-            parent_id (Optional[str]): The ID of the parent partition, or None if the current element is the root.
-        Behavior:
-            - Extracts metadata, ID, category, text, page number, children, coordinates, and image for the current partition.
-            - Handles special cases for tables and images, including coordinate inference and image resizing.
-            - Recursively visits child elements in the partition tree.
-            - Populates a `SelectionData` node with the extracted information and appends it to the `pdf_partitions` dictionary,
-              grouped by page number.
+            elem (Element): The element of the partition.
+            parent_id (Optional[str]): The ID of the parent partition, or None if the current element is a root.
+            metadata (Any): The metadata of `elem`, or None if it is missing.
+            elem_id (Optional[str]): The ID of `elem`.
+            child_nodes (List[SelectionData]): The nodes of the children of `elem`.
+        Returns:
+            SelectionData: The node of `elem`, which is used by the parent to infer its coordinates if necessary.
         """
-            
-        # Get data ref
-        metadata = UnstructuredImporter._parse_unstructured_item(elem, UnstructuredImporter.KEY_METADATA)
-        if metadata is None:
-            print("Cannot extrapolate metadata from selection")
-
-        # Get the partition's ID
-        elem_id = UnstructuredImporter._parse_unstructured_item(elem, UnstructuredImporter.KEY_ID)
         
         # Get the partition's category
         category = UnstructuredImporter._parse_unstructured_item(elem, UnstructuredImporter.KEY_CATEGORY)
@@ -922,47 +1261,21 @@ class UnstructuredImporter:
         # Get the partition's page number
         page_number = UnstructuredImporter._parse_unstructured_item(metadata, UnstructuredImporter.KEY_PAGE_NUMBER)
 
-        # Get the partition's children
-        if metadata is None:
-            children = []
-        else:
-            # element -> `metadata.orig_elements` (it might not exists, e.g., for leafs)
-            orig_elements = UnstructuredImporter._parse_unstructured_item(metadata, UnstructuredImporter.KEY_ORIG_ELEMENTS, should_log=False)
-            if orig_elements is None:
-                children = []
-            else:
-                children = orig_elements
-        child_ids = [UnstructuredImporter._parse_unstructured_item(c, UnstructuredImporter.KEY_ID) for c in children]
-        
-        # Visit children recursively
-        for child in children:
-            self._visit_partition_tree(child, parent_id=elem_id)
+        # Get the children's IDs
+        child_ids = [child.id_ for child in child_nodes]
             
         # Get partition's coordinates
-        coords = self._coords_to_pdf(elem, self._pages_sizes[page_number]) # Coordinate transformation from Scene space to PDF space.
-        # If coords is missing, infer it from children
+        coords = self._coords_to_pdf(elem, self._pages_sizes[page_number - 1]) # Coordinate transformation from Scene space to PDF space.
+        # If coords is missing, infer it from the children in the same page (merged with a single union)
         if not coords and child_ids and page_number in self.pdf_partitions:
-            boxes = []
-            for child in self.pdf_partitions[page_number]:
-                child_data = child#.pdf_partition_tree
-                if child_data.id_ in child_ids and child_data.coords:
-                    boxes.append(child_data.coords)
-            coords = UnstructuredImporter.enclosing_polygon(boxes)
-        
-        
-        # Get partition's image
-        image = None
-        if category == UnstructuredCategory.IMAGE: 
-            # Try to get data from Unstructured   
-            image = UnstructuredImporter._parse_unstructured_item(metadata, UnstructuredImporter.KEY_IMAGE)
-            if image is not None:
-                image = self.resize_base64_image_if_needed(image, self._max_image_resolution)
-        if image is None:
-            # Get the image as a screenshot
-            page_ref = self._document[page_number - 1]
-            image = PolySelectionHandler.extract_poly_image(page_ref, coords)
-            if image is not None:
-                image = BaseSelectionHandler.resize_image(image, self._max_image_resolution) 
+            boxes = [child.coords for child in child_nodes if child.page == page_number and child.coords]
+            tolerance = max(self._simplify_tolerance, 0.001 * float(self._pages_sizes[page_number - 1].min()))
+            coords = UnstructuredImporter.enclosing_polygon(boxes, tolerance)
+        
+        
+        # Get partition's image as a screenshot, rendered only within the partition bounding box
+        page_ref, display_list = self._get_display_list(page_number)
+        screenshot = PolySelectionHandler.extract_poly_image(page_ref, coords, max_size=self._max_image_resolution, display_list=display_list)
         
         # Populate data
         node = SelectionData(
@@ -972,13 +1285,28 @@ class UnstructuredImporter:
             coords = coords,
             text = text,
             category = category,
-            image = image,
+            image = None, # It is set when `screenshot` is encoded
             parent = parent_id,
             children = child_ids,
             description = "",  # Eventually, it will be added by the LLM
             # idx = -1, # It cannot be set since the GUI will take care of it
         )
         self.pdf_partitions.setdefault(page_number, []).append(node)
+        if screenshot is not None:
+            image = self._image_executor.submit(BaseSelectionHandler.resize_image, screenshot, self._max_image_resolution)
+            self._pending_images.append((node, image))
+        return node
+
+
+    def _get_display_list(self, page_number: int) -> Tuple[fitz.Page, fitz.DisplayList]:
+        """Return the page with `page_number` (starting from 1) and its display list, which is reused to render all the screenshots of 
+        the page (its content is interpreted only once). Only the display list of the last page is kept, since partitions are mostly sorted by page."""
+        
+        if self._display_list_page != page_number:
+            page_ref = self._document[page_number - 1]
+            self._display_list = (page_ref, page_ref.get_displaylist())
+            self._display_list_page = page_number
+        return self._display_list
 
 
     def get_partitioned_regions(self) -> Dict[int, List[SelectionData]]:
@@ -996,7 +1324,22 @@ class UnstructuredImporter:
 
 
     @staticmethod
-    def get_parsed_selections(main_view: 'PDFAnnotationTool', partitions: Dict[int, List[Element]]):
+    def _to_polygon(coords: List[Tuple[float, float]]) -> QPolygonF:
+        """Return the polygon with vertices `coords`. Polygons with many vertices are allocated at once and their `(x, y)` 
+        values are copied into the Qt buffer (i.e., contiguous pairs of doubles) with NumPy, without creating a `QPointF` for each vertex."""
+        
+        if len(coords) < UnstructuredImporter.POLYGON_FILL_MIN_POINTS:
+            return QPolygonF([QPointF(*p) for p in coords])
+        points = np.asarray(coords, dtype=np.float64)
+        polygon = QPolygonF(len(points))
+        buffer = polygon.data()
+        buffer.setsize(points.nbytes)
+        np.frombuffer(buffer, dtype=np.float64).reshape(points.shape)[:] = points
+        return polygon
+
+
+    @staticmethod
+    def get_parsed_selections(main_view: 'PDFAnnotationTool', partitions: Dict[int, List['Element']]):
         """
         Parses partitioned PDF elements and creates selectable polygon items for annotation.
 
@@ -1009,11 +1352,12 @@ class UnstructuredImporter:
         """
         
         to_add = []
+        pdf_path = main_view.pdf_path
         for _, elements in partitions.items():
             for node in elements:
-                region = QPolygonF([QPointF(x, y) for x, y in node.coords])
+                region = UnstructuredImporter._to_polygon(node.coords)
                 selection_item = SelectablePolyItem(main_view, region, do_transform = False)
-                node.doc = main_view.pdf_path
+                node.doc = pdf_path
                 selection_item.data = node
                 to_add.append(selection_item)
         return to_add
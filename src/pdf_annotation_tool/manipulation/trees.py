@@ -22,7 +22,7 @@
 import json
 import abc
 
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 
 from PyQt5.QtWidgets import QWidget, QTreeWidget, QTreeWidgetItem, QVBoxLayout, QAbstractItemView, QMenu, QAction, QMessageBox, QInputDialog, QCheckBox, QDialog
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QItemSelection, QPoint
@@ -35,7 +35,6 @@ from pdf_annotation_tool.selection.graphic import SelectableRegionItem
 
 
 # TODO check if all the functions are necessary and check private/public methods
-# TODO it could be more efficient if rebuild receives only the changes instead of rebuilding the entire tree
 
 
 # Base Tree class used by `PageTreeWidget` and `HierarchyTreeWidget`
@@ -46,7 +45,8 @@ class BaseSelectionTree(QTreeWidget):
     
     # Signals for external listeners
     selection_changed = pyqtSignal() # emitted when the selection in the tree changes
-    data_changed = pyqtSignal() # emitted when the underlying data changes (e.g., after deletion or edit)
+    data_changed = pyqtSignal() # emitted when the underlying data changes (e.g., after drag-and-drop)
+    data_patched = pyqtSignal(list) # emitted with the operations of `apply_delta` when the underlying data changes and the tree updated itself in place (e.g., after deletion or edit)
     find_in_pdf = pyqtSignal(int) # emitted to request the PDF viewer to go to a specific page
     
     # Role data stored inside the tree's node. 
@@ -61,6 +61,9 @@ class BaseSelectionTree(QTreeWidget):
    
     # Columns shown in the tree for each node 
     TREE_HEADERS = ["ID", "Category", "Text", "Description", "Page", "Idx", "Parent", "Children"]
+    
+    # The tree is rebuilt (instead of updated by `apply_delta`) when the nodes updated since the last rebuild exceed this ratio of the selections
+    REBUILD_UPDATES_RATIO = 0.5
 
 
     def __init__(self, selections: SelectionsManager, parent: QWidget = None, enable_drag_drop: bool = True, allow_edit: bool = True, selection_synch_checkbox: QCheckBox = None):
@@ -75,10 +78,13 @@ class BaseSelectionTree(QTreeWidget):
         # Class properties
         self.selections = selections # The data to be shown in the tree
         self.mapping_cache = {}  # `{id : (page, idx, item)}` => the auxiliary data structure to retrieve data from the ID stored in each nodes with the `ID_ROLE`
+        self.items_cache = {}  # `{id : QTreeWidgetItem}` => the node showing each selection in the tree, to retrieve it without traversing the tree (see `find_node_by_id`)
         self.enabled_categories = set(SelectionCategory) # set of enabled categories (SelectionCategory) to be shown in the tree used to filter nodes
         self.allow_edit = allow_edit # Whether the user can edit selection data by double-clicking a node or using the context menu
         self._selected_node = set() # set of currently selected nodes (ids)
         self._selection_synch_checkbox = selection_synch_checkbox # It enable/disable automatic synching among trees and selections focus on PDF while interacting with the tree
+        self._updates_since_rebuild = 0 # The number of nodes updated by `apply_delta` since the last rebuild
+        self.patching = False # Whether the tree is changing `selections` and updating itself in place, i.e., it should not be rebuilt meanwhile (see `_change_and_patch`)
         
         # Tree configuration
         self.setHeaderLabels(BaseSelectionTree.TREE_HEADERS)
@@ -184,19 +190,28 @@ class BaseSelectionTree(QTreeWidget):
             we do not call setHidden() here because parent visibility depends on children; final visibility is computed later in one pass.
             """
             
-            label, tips = BaseSelectionTree._label_for_item(selection)   # returns (str, [tooltips])
-            item = QTreeWidgetItem(label)
+            item = QTreeWidgetItem()
             item.setData(0, BaseSelectionTree.ID_ROLE, selection.data.id_)
             # item.setData(0, BaseSelectionTree.DATA_ROLE, sp.data) # TODO to remove
             item.setFlags(item.flags() | Qt.ItemIsDragEnabled | Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            for i, t in enumerate(tips):
-                item.setToolTip(i, t)
+            self._update_item(item, selection)
+            self.items_cache[selection.data.id_] = item
+            return item
 
-            # initial visibility based only on the item's own category
-            initial_visible = selection.data.category in self.enabled_categories
-            item.setData(0, BaseSelectionTree.VIS_FLAG_ROLE, initial_visible)
 
-            return item
+    def _update_item(self, item: QTreeWidgetItem, selection: SelectableRegionItem) -> None:
+        """Set the labels, tooltips and the 'initial visible' flag of the `item` showing the `selection`. It is used by `_make_item_for_selection` 
+        and `apply_delta` (to update a node in place)."""
+        
+        label, tips = BaseSelectionTree._label_for_item(selection)   # returns (str, [tooltips])
+        for i, l in enumerate(label):
+            item.setText(i, l)
+        for i, t in enumerate(tips):
+            item.setToolTip(i, t)
+
+        # initial visibility based only on the item's own category
+        initial_visible = selection.data.category in self.enabled_categories
+        item.setData(0, BaseSelectionTree.VIS_FLAG_ROLE, initial_visible)
 
 
     def set_category_enabled(self, category: SelectionCategory, enabled : bool) -> None:
@@ -206,7 +221,21 @@ class BaseSelectionTree(QTreeWidget):
             self.enabled_categories.add(category)
         else:
             self.enabled_categories.discard(category)
-        self.rebuild_safe()
+        
+        # Only the visibility of the nodes changes, so they are updated in place instead of rebuilding the tree
+        updates_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False) # The tree is repainted only once, at the end
+        self.blockSignals(True)
+        try:
+            for sel_id, item in self.items_cache.items():
+                if sel_id not in self.mapping_cache:
+                    continue
+                _, _, sp = self.mapping_cache[sel_id]
+                item.setData(0, BaseSelectionTree.VIS_FLAG_ROLE, sp.data.category in self.enabled_categories)
+            self._apply_visibility_post_build()
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(updates_enabled)
 
 
     def _apply_visibility_post_build(self) -> None:
@@ -321,9 +350,8 @@ class BaseSelectionTree(QTreeWidget):
             else:
                 print(f"Error, lost node with data: {nd}")
         
-        # Delete all the retrieved node with `SelectionsManager` and emit data_changed signal
-        self.selections.remove_selection_set(nodes)
-        self.data_changed.emit()
+        # Delete all the retrieved node with `SelectionsManager`, remove them from the tree, and emit data_patched signal
+        self._change_and_patch(lambda: self.selections.remove_selection_set(nodes), [("remove", node.data.id_, None) for node in nodes])
 
 
     def _on_find_in_pdf(self) -> None:
@@ -397,11 +425,9 @@ class BaseSelectionTree(QTreeWidget):
             
             # If the data was edited, update the selection
             edited_sel = sp.copy(dialog.edited_data)
-            self.selections.edit_selection(page, idx, edited_sel)
             
-            # Rebuild the tree and emit data_changed signal
-            self.rebuild()
-            self.data_changed.emit()
+            # Update the edited node and emit data_patched signal
+            self._change_and_patch(lambda: self.selections.edit_selection(page, idx, edited_sel), [("edit", sel_id, edited_sel)])
         
     
     @staticmethod
@@ -471,6 +497,8 @@ class BaseSelectionTree(QTreeWidget):
         root.setData(0, PageTreeWidget.ID_ROLE, BaseSelectionTree.ROOT_ID)
         self.addTopLevelItem(root)
         self.root = root
+        self.items_cache = {} # The tree is being rebuilt
+        self._updates_since_rebuild = 0
         
         
     @abc.abstractmethod
@@ -491,11 +519,93 @@ class BaseSelectionTree(QTreeWidget):
     def rebuild_safe(self) -> None:
         """Invokes `self.rebuild()` while suppressing selection and data change signals (e.g., to preserve the expanded state of nodes)."""
         
+        updates_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False) # The tree is repainted only once, after it is built
         self.blockSignals(True)
         try:
             self.rebuild()
         finally:
             self.blockSignals(False)
+            self.setUpdatesEnabled(updates_enabled)
+
+
+    def apply_delta(self, ops: List[Tuple[str, str, Any]]) -> None:
+        """Update the tree in place after the `ops` have been applied to `selections`, instead of rebuilding it. Each operation is a tuple 
+        `(kind, id, payload)`, where `kind` can be:
+         - `"remove"` (with `payload=None`) to remove the node with `id` (its remaining children are moved to the root, as done by `rebuild` for 
+           the selections whose parent is missing). Nodes already missing (e.g., if the tree has been rebuilt in the meanwhile) are ignored.
+         - `"edit"` (with the edited `SelectableRegionItem` as `payload`) to update the labels of the node with `id`, which should keep its page, 
+           index and parent.
+        Other operations (e.g., `"add"` and `"move"`), edits that change the tree structure, and too many updates since the last rebuild 
+        (see `REBUILD_UPDATES_RATIO`) fall back to `rebuild_safe`. It is used by `_on_delete` and `open_selection_editor_by_id`."""
+        
+        self._updates_since_rebuild += len(ops)
+        if self._updates_since_rebuild > BaseSelectionTree.REBUILD_UPDATES_RATIO * len(self.mapping_cache):
+            self.rebuild_safe()
+            return
+        
+        updates_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False) # The tree is repainted only once, after it is updated
+        self.blockSignals(True)
+        try:
+            # The mapping is refreshed after removing the nodes, which could be deselected in the meanwhile (see `on_selection_changed`)
+            old_mapping = self.mapping_cache
+            items = self.items_cache # Removed nodes are also removed from it (see `_remove_item`)
+            edited_pages = set() # The pages where nodes have been removed, i.e., where the other nodes changed their index
+            for kind, sel_id, payload in ops:
+                item = items.get(sel_id, None)
+                old_ref = old_mapping.get(sel_id, None)
+                if kind == "remove":
+                    if item is not None:
+                        self._remove_item(item)
+                    if old_ref is not None:
+                        edited_pages.add(old_ref[0])
+                elif kind == "edit" and item is not None and old_ref is not None and \
+                        (old_ref[2].data.page, old_ref[2].data.idx, old_ref[2].data.parent) == (payload.data.page, payload.data.idx, payload.data.parent):
+                    self._update_item(item, payload)
+                else:
+                    self.rebuild()
+                    return
+            self.refresh_mapping()
+            
+            # Update the index shown by the remaining nodes of the edited pages, and the visibility of all the nodes
+            for page in edited_pages:
+                for sp in self.selections.get(page, []):
+                    item = items.get(sp.data.id_, None)
+                    if item is not None:
+                        self._update_item(item, sp)
+            self._apply_visibility_post_build()
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(updates_enabled)
+
+
+    def _change_and_patch(self, change: Callable[[], None], ops: List[Tuple[str, str, Any]]) -> None:
+        """Invoke `change`, which modifies `selections` as described by `ops`, update the tree with `apply_delta(ops)`, and emit `data_patched`.
+        While `change` is pushed on the undo stack, `patching` is True, so that the listeners of the stack do not rebuild the tree (see 
+        `TreesPanel.is_patching`). It is used by `_on_delete` and `open_selection_editor_by_id`."""
+        
+        self.patching = True
+        try:
+            change()
+            self.apply_delta(ops)
+        finally:
+            self.patching = False
+        self.data_patched.emit(ops)
+
+
+    def _remove_item(self, item: QTreeWidgetItem) -> None:
+        """Remove the `item` from the tree (and from `items_cache`) and move its children to the root. It is used by `apply_delta`."""
+        
+        self.items_cache.pop(item.data(0, BaseSelectionTree.ID_ROLE), None)
+        children = item.takeChildren()
+        if children:
+            self.root.addChildren(children)
+        parent = item.parent()
+        if parent is None:
+            self.takeTopLevelItem(self.indexOfTopLevelItem(item))
+        else:
+            parent.removeChild(item)
 
 
     def search_nodes(self, query: str, fields: Set[str]) -> List[Tuple[int, int]]:
@@ -614,34 +724,13 @@ class BaseSelectionTree(QTreeWidget):
 
     def find_node_by_id(self, target_id: str) -> QTreeWidgetItem | None:
         """
-        Recursively searches for a node with the `target_id`. It returns the matching item or None if not found.
+        Return the node with the `target_id` from `items_cache` (or the ROOT), or None if not found.
         It is used by `expand_and_select_by_id` to find and select a node based on its ID.
         """
 
-
-        def recurse(parent_item: QTreeWidgetItem) -> QTreeWidgetItem | None:
-            """Recursive helper function to search through child items."""
-            
-            for i in range(parent_item.childCount()):
-                child = parent_item.child(i)
-                if child.data(0, BaseSelectionTree.ID_ROLE) == target_id:
-                    return child
-                found = recurse(child)
-                if found:
-                    return found
-            return None
-
-
-        # search top-level items
-        for i in range(self.topLevelItemCount()):
-            item = self.topLevelItem(i)
-            if item.data(0, BaseSelectionTree.ID_ROLE) == target_id:
-                return item
-            found = recurse(item)
-            if found:
-                return found
-
-        return None
+        if target_id == BaseSelectionTree.ROOT_ID:
+            return self.root
+        return self.items_cache.get(target_id, None)
         
 
     def expand_and_select(self, nodes: List[Tuple[int, int]]) -> None: 
@@ -757,32 +846,38 @@ class PageTreeWidget(BaseSelectionTree):
         # Preserve expanded state
         expanded_keys = self.get_expanded_items()
         
-        # Start building a new tree
-        self.clear()
-        self.add_root() # It also sets `self.root``
-        self.refresh_mapping() # in case you need it during the build (e.g., for `find_node_by_id`)
-
-        # Iterate over pages and regions in the `selections` dictionary to build the tree
-        for page_number, selections in self.selections.items():
-            # create a page node
-            page_item = self._make_page_node(page_number)  
-            
-            for idx, sp in enumerate(selections):
-                # assign page/idx
-                sp.data.page = page_number
-                sp.data.idx = idx
-
-                # create item (does not call setHidden; stores initial flag)
-                child = self._make_item_for_selection(sp)
-                page_item.addChild(child)
-
-        # update mapping cache (if your refresh_mapping uses the tree)
-        self.refresh_mapping()
-        # compute final visibility bottom-up (single traversal)
-        self._apply_visibility_post_build()
-        # Restore node expansion as it was before rebuilding
-        self.restore_expanded_items(expanded_keys)
-        #self.expandAll()
+        updates_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False) # The tree is repainted only once, after it is built
+        try:
+            # Start building a new tree
+            self.clear()
+            self.add_root() # It also sets `self.root``
+            self.refresh_mapping() # in case you need it during the build (e.g., for `find_node_by_id`)
+
+            # Iterate over pages and regions in the `selections` dictionary to build the tree
+            for page_number, selections in self.selections.items():
+                # create a page node
+                page_item = self._make_page_node(page_number)  
+                
+                children = []
+                for idx, sp in enumerate(selections):
+                    # assign page/idx
+                    sp.data.page = page_number
+                    sp.data.idx = idx
+
+                    # create item (does not call setHidden; stores initial flag)
+                    children.append(self._make_item_for_selection(sp))
+                page_item.addChildren(children) # All at once
+
+            # update mapping cache (if your refresh_mapping uses the tree)
+            self.refresh_mapping()
+            # compute final visibility bottom-up (single traversal)
+            self._apply_visibility_post_build()
+            # Restore node expansion as it was before rebuilding
+            self.restore_expanded_items(expanded_keys)
+            #self.expandAll()
+        finally:
+            self.setUpdatesEnabled(updates_enabled)
      
        
     def _make_page_node(self, page_number: int) -> QTreeWidgetItem:
@@ -796,6 +891,16 @@ class PageTreeWidget(BaseSelectionTree):
         self.root.addChild(page_item)
         return page_item
     
+    
+    def _remove_item(self, item: QTreeWidgetItem) -> None:
+        """Remove the `item` from the tree, as well as its page node if it becomes empty (as done by `rebuild` for pages without selections). 
+        See `BaseSelectionTree._remove_item`."""
+        
+        page_item = item.parent()
+        super()._remove_item(item)
+        if page_item is not None and page_item.data(0, BaseSelectionTree.ID_ROLE) == PageTreeWidget.PAGE_NODE_ID and page_item.childCount() == 0:
+            self.root.removeChild(page_item)
+    
        
     def dropEvent(self, event: QDropEvent) -> None:
         """Handle drop events for drag-and-drop operations within the tree widget.
@@ -1084,35 +1189,47 @@ class HierarchyTreeWidget(BaseSelectionTree):
 
         # clear and ensure mapping_cache contains sp -> data
         expanded_keys = self.get_expanded_items()
-        self.clear()
-        self.add_root() # It updates self.root
-        self.refresh_mapping() 
-
-        node_items = {}
-
-        # create items for **all** selections and record initial visibility flags
-        for sel_id, (_, _, sp) in self.mapping_cache.items():
-            item = self._make_item_for_selection(sp)
-            node_items[sel_id] = item
-
-        # attach by parent (keeps full tree structure, filtered nodes stay in tree)
-        for sel_id, item in node_items.items():
-            _, _, sp = self.mapping_cache[sel_id]
-            parent_id = sp.data.parent
-            if parent_id and parent_id in node_items:
-                node_items[parent_id].addChild(item)
-            else:
-                self.root.addChild(item)
+        updates_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False) # The tree is repainted only once, after it is built
+        try:
+            self.clear()
+            self.add_root() # It updates self.root
+            self.refresh_mapping() 
+
+            node_items = {}
+
+            # create items for **all** selections and record initial visibility flags
+            for sel_id, (_, _, sp) in self.mapping_cache.items():
+                item = self._make_item_for_selection(sp)
+                node_items[sel_id] = item
+
+            # group by parent (keeps full tree structure, filtered nodes stay in tree)
+            root_children = []
+            children = {} # `{parent ID: [child items]}`
+            for sel_id, item in node_items.items():
+                _, _, sp = self.mapping_cache[sel_id]
+                parent_id = sp.data.parent
+                if parent_id and parent_id in node_items:
+                    children.setdefault(parent_id, []).append(item)
+                else:
+                    root_children.append(item)
+            
+            # attach the children of each parent at once, and the root children at last (i.e., after their subtrees are built)
+            for parent_id, child_items in children.items():
+                node_items[parent_id].addChildren(child_items)
+            self.root.addChildren(root_children)
 
-        # mapping_cache might need refresh now that items are attached
-        self.refresh_mapping()
+            # mapping_cache might need refresh now that items are attached
+            self.refresh_mapping()
 
-        # compute final visibility bottom-up in a single pass
-        self._apply_visibility_post_build()
+            # compute final visibility bottom-up in a single pass
+            self._apply_visibility_post_build()
 
-        self.restore_expanded_items(expanded_keys)
-        #self.expandAll()
-        ##self.selection_changed.emit()
+            self.restore_expanded_items(expanded_keys)
+            #self.expandAll()
+            ##self.selection_changed.emit()
+        finally:
+            self.setUpdatesEnabled(updates_enabled)
 
 
     def dropEvent(self, event: QDropEvent) -> None:
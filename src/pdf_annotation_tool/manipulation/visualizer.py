@@ -19,7 +19,7 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 # -----------------------------------------------------------------------------
 
-from typing import Dict, List, Set, Tuple
+from typing import Any, Dict, List, Set, Tuple
 
 from PyQt5.QtWidgets import QWidget, QSplitter, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QLineEdit, QMenu, QToolButton, QWidgetAction, QTreeWidget, QTreeWidgetItemIterator
 from PyQt5.QtCore import Qt
@@ -103,8 +103,10 @@ class TreesPanel(QWidget):
         # Hook signals
         self.page_tree.selection_changed.connect(self._on_page_selection_changed)
         self.page_tree.data_changed.connect(self._on_page_data_changed)
+        self.page_tree.data_patched.connect(self._on_page_data_patched)
         self.hier_tree.selection_changed.connect(self._on_hier_selection_changed)
         self.hier_tree.data_changed.connect(self._on_hier_data_changed)
+        self.hier_tree.data_patched.connect(self._on_hier_data_patched)
         self.search_btn.clicked.connect(self._on_search)
         self.search_input.returnPressed.connect(self._on_search)
     
@@ -251,6 +253,18 @@ class TreesPanel(QWidget):
         self.page_tree.rebuild_safe()
 
 
+    def _on_page_data_patched(self, ops: List[Tuple[str, str, Any]]) -> None:
+        """Update hierarchy tree in place when page tree data changes and page tree updated itself (see `BaseSelectionTree.apply_delta`)."""
+
+        self.hier_tree.apply_delta(ops)
+
+
+    def _on_hier_data_patched(self, ops: List[Tuple[str, str, Any]]) -> None:
+        """Update page tree in place when hierarchy tree data changes and hierarchy tree updated itself (see `BaseSelectionTree.apply_delta`)."""
+
+        self.page_tree.apply_delta(ops)
+
+
     def _select_ids_in_tree(self, tree: QTreeWidget, ids: Set[str]) -> None:
         """Select items in tree widget by their selection IDs and expand parent nodes.
         
@@ -350,6 +364,17 @@ class TreesPanel(QWidget):
         s = set(self.page_tree.get_selected_nodes()) | set(self.hier_tree.get_selected_nodes())
         return list(s)
 
+    def is_patching(self) -> bool:
+        """Return whether one of the trees is changing the selections and updating itself in place, in which case 
+        `populate_tree` is not needed (see `BaseSelectionTree.patching`).
+        
+        Returns:
+            bool: True if the page tree or the hierarchy tree is patching.
+        """
+
+        return self.page_tree.patching or self.hier_tree.patching
+
+
     def populate_tree(self, selections: SelectionsManager) -> None:
         """Update both trees with new selections data and `rebuild` their displays.
         
@@ -20,7 +20,6 @@
 # -----------------------------------------------------------------------------
 
 import abc
-import copy
 from typing import Self, List, Tuple, Union, Optional, TYPE_CHECKING
 import fitz  # PyMuPDF
 
@@ -278,6 +277,8 @@ class SelectableRegionItem: #(QAbstractGraphicsShapeItem):
 class SelectablePolyItem(SelectableRegionItem, QGraphicsPolygonItem):
     """Implements a selectable polygon item in the PDF view, inheriting from `SelectableRegionItem` and `QGraphicsPolygonItem`."""
     
+    Type = QGraphicsPolygonItem.UserType + 1 # Returned by `type()` to identify these items in the scene
+    
     def __init__(self, main_view: 'PDFAnnotationTool', polygon: QPolygonF = None, do_transform: bool = True):
         """Initialize the selectable polygon item. If `polygon` is given, it is used to initialize the `QGraphicsPolygonItem`, otherwise an empty polygon is created.
         If `do_transform` is `False`, the points in `polygon` are assumed to be already in PDF coordinates, and no conversion will be performed when the selection is created."""
@@ -293,6 +294,12 @@ class SelectablePolyItem(SelectableRegionItem, QGraphicsPolygonItem):
         if not do_transform:
             self.converted_to_pdf_space = True # data is already given as PDF coordinates
 
+
+    def type(self) -> int:
+        """Return the type of this graphic item, i.e., `SelectablePolyItem.Type`."""
+        
+        return SelectablePolyItem.Type
+
      
     def _get_qt_points(self) -> List[QPointF]:
         """Return the points of the polygon as a list of `QPointF`. This method is required by `SelectableRegionItem`."""
@@ -315,7 +322,7 @@ class SelectablePolyItem(SelectableRegionItem, QGraphicsPolygonItem):
         c = SelectablePolyItem(self.main_view, self.polygon(), do_transform=False)
         if data is None:
             data = self.data
-        c.data = copy.deepcopy(data)
+        c.data = data.fast_clone()
         return c
 
     
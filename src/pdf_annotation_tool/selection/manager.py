@@ -513,11 +513,11 @@ class RemoveAllCmd(BaseCmd): # Removes a set of selections and does not preserve
                     if not page_items: # if it is empty
                         del dictionary[page]
                     to_remove_id_list.remove(sel.data.id_)
-                    if len(to_remove_id_list) <= 0:
-                        return
                     removed = True
             if removed:
                 SelectionsManager._update_page_indexes(dictionary, page)
+            if len(to_remove_id_list) <= 0: # The indexes of the last edited page are updated as well
+                return
             
         if len(to_remove_id_list) > 0:
             print(f"Error, cannot remove sections: {to_remove_id_list}") # TODO maake alert?
@@ -22,7 +22,6 @@
 import json
 import os
 import fitz
-import requests
 import traceback
 
 from typing import Optional, List, Dict
@@ -36,7 +35,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QRectF, QPointF
 from PyQt5.QtGui import QPixmap, QImage, QPen, QPolygonF,  QColor, QFont, QCloseEvent
 
-from pdf_annotation_tool.builder.handler import BaseSelectionHandler
+from pdf_annotation_tool.builder.handler import BaseSelectionHandler, PolySelectionHandler
 from pdf_annotation_tool.builder.selector import SelectableGraphicsView
 from pdf_annotation_tool.manipulation.augmenting import AugmentConfigDialog
 from pdf_annotation_tool.manipulation.importer import UnstructuredDialog, UnstructuredImporter
@@ -88,7 +87,10 @@ class PDFAnnotationTool(QMainWindow): # The mai GUI view.
         self.should_autosave = False
         self.pdf_zoom = 1
         self.pdf_to_scene_transform = None
+        self.page_rect_scene = (0, 0) # The `(width, height)` of the current page in scene coordinates, used by `SelectableGraphicsView` to keep selections within the page
         self.selection_to_redraw = None # used by `SelectableRegionItem` and `BaseSelectionHandler` to allow redrawing a selection
+        self._shared_trees_panel = None # The `TreesPanel` reused by every `SelectionDialog`, do not access it, use `_get_or_build_trees_panel` instead.
+        self._shared_trees_panel_outdated = True # Whether `_shared_trees_panel` should be rebuilt since `selections` changed
         self.set_pdf_to_scene_transformation_matrix() # It sets `self.pdf_to_scene_transform`
        
                
@@ -243,7 +245,11 @@ class PDFAnnotationTool(QMainWindow): # The mai GUI view.
         """
          
         self.show_page()
-        self.trees_panel.populate_tree(self._selections)
+        # The trees changing the selections update themselves in place (see `BaseSelectionTree.apply_delta`)
+        if not self.trees_panel.is_patching():
+            self.trees_panel.populate_tree(self._selections)
+        if self._shared_trees_panel is None or not self._shared_trees_panel.is_patching():
+            self._shared_trees_panel_outdated = True
 
 
     def _on_page_tree_change(self) -> None:
@@ -374,6 +380,7 @@ class PDFAnnotationTool(QMainWindow): # The mai GUI view.
             It returns the file path where the PDF has been saved.
             """
             
+            import requests # Imported here since it is only needed when opening a PDF from an URL
             response = requests.get(url)
             download_path = f"{working_dir}/{PDFAnnotationTool.DOWNLOAD_FOLDER}/"  
             os.makedirs(download_path, exist_ok=True)
@@ -444,12 +451,15 @@ class PDFAnnotationTool(QMainWindow): # The mai GUI view.
         """
         
         self._doc = fitz.open(path)
+        PolySelectionHandler.clear_page_chars_cache() # Characters of another document with the same path might be cached
+        fitz.TOOLS.store_shrink(100) # Release the resources that MuPDF cached for the previous document
         self._page_idx = 0
         self._allowed_pages = range(1, len(self._doc) + 1) # starts from 1
         
         # Clear GUI and lose data if a project was already opened (TODO add not saved alert)
         self._selections.clear() # Delete all selections
         self.trees_panel.populate_tree(self._selections)
+        self._shared_trees_panel_outdated = True
         self.show_page()
     
     
@@ -784,7 +794,34 @@ class PDFAnnotationTool(QMainWindow): # The mai GUI view.
         
         self._reindex_titles_tree_children_from_sections()
         self.trees_panel.populate_tree(self._selections)
+        self._shared_trees_panel_outdated = True
         self.show_page()
+
+
+    def _get_or_build_trees_panel(self, parent: QWidget) -> TreesPanel:
+        """
+        Get the `TreesPanel` shown by `SelectionDialog` to choose the parent of a selection.
+        
+        The panel is built only once and reused by all the dialogs, it is rebuilt only if
+        `selections` changed since the last time it has been shown.
+        
+        Args:
+            parent (QWidget): The dialog that shows the panel
+            
+        Returns:
+            TreesPanel: The panel showing only the hierarchical tree
+        """
+        
+        if self._shared_trees_panel is None:
+            self._shared_trees_panel = TreesPanel(self._selections, parent=parent, show_page_tree=False, show_hier_tree=True, enable_drag_drop=False, enable_multi_selection=False)
+        else:
+            self._shared_trees_panel.setParent(parent)
+            if self._shared_trees_panel_outdated:
+                self._shared_trees_panel.populate_tree(self._selections)
+            self._shared_trees_panel.search_input.clear()
+            self._shared_trees_panel.hier_tree.clearSelection()
+        self._shared_trees_panel_outdated = False
+        return self._shared_trees_panel
     
     
     def show_page(self) -> None:
@@ -807,6 +844,7 @@ class PDFAnnotationTool(QMainWindow): # The mai GUI view.
         page_num = self.get_page_num()             
         page = self.get_doc_page()
         pix = page.get_pixmap(matrix=fitz.Matrix(self.pdf_zoom, self.pdf_zoom))
+        self.page_rect_scene = (page.rect.width * self.pdf_zoom, page.rect.height * self.pdf_zoom)
         # Convert to QImage
         img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888).copy()
         pixmap = QPixmap.fromImage(img)
@@ -113,6 +113,7 @@ class ProgressingRunner(QDialog):
     ERROR_KEY = "error"
     CANCEL_KEY = "cancel"
     OUTCOME_KEY = "result"
+    PROGRESS_KEY = "progress"
     GENERIC_ERROR = "Generic error"
     GENERIC_CANCEL = "Cancelled by the user"
 
@@ -238,7 +239,8 @@ class ProgressingRunner(QDialog):
         Checks if the widget is visible and processes the result from the queue.
 
         If the widget is visible and the queue is not empty, retrieves the result from the queue,
-        performs cleanup, and accepts the result.
+        performs cleanup, and accepts the result. Progress messages (see `add_progress`) are shown
+        in the dialog label while waiting for the result.
 
         Returns:
             None
@@ -246,8 +248,13 @@ class ProgressingRunner(QDialog):
         
         if not self.isVisible():
             return
-        if self.queue and not self.queue.empty():
-            self.result = self.queue.get()
+        while self.queue and not self.queue.empty():
+            result = self.queue.get()
+            progress = ProgressingRunner.get_progress(result)
+            if progress is not None:
+                self.label.setText(progress)
+                continue
+            self.result = result
             self.cleanup()
             self.accept()
 
@@ -370,6 +377,26 @@ class ProgressingRunner(QDialog):
         queue.put(ProgressingRunner.build_error(outcome))
 
         
+    @staticmethod
+    def add_exception(queue: Queue, exception: Exception) -> None:
+        """
+        Adds an `exception` raised by the task to the provided queue as an error (see `add_error`). Its traceback
+        is printed only if Python runs without optimizations (i.e., `__debug__`), since it is not needed by the user.
+        It should be called within the `except` block that caught `exception`.
+
+        Args:
+            queue (Queue): The queue to which the error will be added.
+            exception (Exception): The exception raised by the task.
+
+        Returns:
+            None
+        """
+        
+        ProgressingRunner.add_error(queue, exception)
+        if __debug__:
+            traceback.print_exc()
+
+
     @staticmethod
     def add_cancel(queue: Queue, outcome: Optional[str] = None) -> None:
         """
@@ -404,6 +431,23 @@ class ProgressingRunner(QDialog):
         queue.put(ProgressingRunner.build_outcome(outcome))
 
 
+    @staticmethod
+    def add_progress(queue: Queue, message: str) -> None:
+        """
+        Adds a progress message to the provided queue. Differently from outcomes, errors and cancellations,
+        it does not terminate the task, and it is only shown to the user while waiting.
+
+        Args:
+            queue (Queue): The queue to which the progress message will be added.
+            message (str): The message describing the progress of the task.
+
+        Returns:
+            None
+        """
+        
+        queue.put({ProgressingRunner.PROGRESS_KEY: message})
+
+
     @staticmethod
     def get_error(outcome: Dict) -> Optional[str]:
         """
@@ -447,3 +491,18 @@ class ProgressingRunner(QDialog):
         """
         
         return outcome.get(ProgressingRunner.OUTCOME_KEY, None)
+
+
+    @staticmethod
+    def get_progress(outcome: Dict) -> Optional[str]:
+        """
+        Retrieves the progress message from the provided dictionary using the PROGRESS_KEY.
+
+        Args:
+            outcome (Dict): A dictionary containing progress data.
+
+        Returns:
+            Optional[str]: The progress message if present, otherwise None.
+        """
+        
+        return outcome.get(ProgressingRunner.PROGRESS_KEY, None)